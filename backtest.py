@@ -0,0 +1,64 @@
+"""
+Rolling historical backtest: the case study as of every past date.
+
+    python backtest.py --start 2020-01-01 --every 21 --workers 4
+    python backtest.py --restart
+
+Each date is checkpointed under --checkpoint-dir, so rerunning the same
+command after an interruption resumes where it stopped.
+"""
+
+import argparse
+from pathlib import Path
+from portfolio.case_study import getDataset
+
+
+def parseArguments(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start", default="2020-01-01", help="first backtest date")
+    parser.add_argument("--end", default=None, help="last backtest date")
+    parser.add_argument("--every", type=int, default=1, help="backtest every n-th trading day")
+    parser.add_argument("--paths", type=int, default=10000, help="simulated paths per date")
+    parser.add_argument("--antithetic", action="store_true")
+    parser.add_argument("--sampler", choices=["pseudo", "sobol"], default="pseudo")
+    parser.add_argument("--workers", type=int, default=1, help="processes running date blocks")
+    parser.add_argument(
+        "--block-size", type=int, default=21, help="consecutive dates per warm-started block"
+    )
+    parser.add_argument("--checkpoint-dir", default="reports/backtest")
+    parser.add_argument("--restart", action="store_true", help="discard existing checkpoints")
+    parser.add_argument("--output", default="reports/backtest_results.csv")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parseArguments(argv)
+
+    from portfolio.Backtest import run_backtest
+
+    results = run_backtest(
+        getDataset(),
+        start=args.start,
+        end=args.end,
+        every=args.every,
+        n_workers=args.workers,
+        block_size=args.block_size,
+        checkpoint_dir=args.checkpoint_dir,
+        restart=args.restart,
+        n_paths=args.paths,
+        antithetic=args.antithetic,
+        sampler=args.sampler,
+    )
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(args.output, index=False)
+    print(
+        results.groupby("Strategy Name", sort=False)[
+            ["Mean IRR", "VaR", "CVaR", "Weighted Analysis"]
+        ].mean()
+    )
+    print(f"Backtest results for {results['Date'].nunique()} dates written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Evaluate every strategy on a set of EUR cash-flow schedules.
+
+    python batch.py
+    python batch.py --schedules data/schedules.csv --workers 4
+"""
+
+import argparse
+from pathlib import Path
+from main import addModelArguments, buildFromArguments, enableInstrumentation
+from helpers import instrumentation
+from helpers.instrumentation import stage
+
+
+def parseArguments(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    addModelArguments(parser)
+    parser.add_argument("--schedules", default="data/schedules.csv", help="CSV or JSON schedules")
+    parser.add_argument("--output", default="reports/batch_results.csv")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parseArguments(argv)
+
+    from portfolio.BatchRunner import load_schedules, run_batch
+
+    if args.instrument:
+        enableInstrumentation(args)
+
+    _, initial_params, model = buildFromArguments(args)
+
+    schedules = load_schedules(args.schedules)
+
+    with stage("batch"):
+        results = run_batch(model, schedules, initial_params, n_workers=args.workers)
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(args.output, index=False)
+    print(results[["Fund", "Strategy Name", "Mean IRR", "VaR", "CVaR", "Weighted Analysis"]])
+    print(f"Batch results written to {args.output}")
+
+    if args.instrument:
+        instrumentation.report()
+        instrumentation.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Benchmark cases. Each case takes (n_paths, horizon), does its setup and
+returns the callable to be timed. SCALES says which of the two parameters a
+case depends on, so cases that ignore them are only run once.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import main
+from portfolio import case_study
+from helpers.fx_options import implied_volatility
+from model.Heston import HestonModel
+from metrics.ExtremeScenarios import select_tail_paths
+from metrics.IRR import calculate_irr, solve_irr
+from metrics.Sensitivity import parameter_sensitivities
+from metrics.VAR import calculate_cvar, calculate_var
+from strategies.BatchedHedge import BatchedForwardHedging
+from strategies.DynamicDelta import DynamicDeltaHedging
+from strategies.NoHedging import NoHedging
+from strategies.OptimisedHedge import OptimisedForwardHedging
+from strategies.PartialHedge import PartialForwardHedging
+from strategies.RebalancedDelta import RebalancedDeltaHedging
+from strategies.StaticForward import StaticForwardHedging
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Calibrated-scale parameters, so the benchmarks do not depend on a calibration
+BENCHMARK_PARAMS = {
+    "S0": 1.16,
+    "v0": 0.0064,
+    "theta": 0.0081,
+    "kappa": 1.5,
+    "sigma": 0.3,
+    "rho": -0.3,
+    "mu": 0.0,
+    "usd_ir": 0.035,
+    "eur_ir": 0.0215,
+}
+
+STRATEGIES = {
+    "No Hedge": NoHedging,
+    "Static Forward Hedge": StaticForwardHedging,
+    "Partial Hedge": PartialForwardHedging,
+    "Batched Partial Hedge": lambda cfs: BatchedForwardHedging(cfs, [0.5, 0.8]),
+    "Dynamic Delta Hedge": DynamicDeltaHedging,
+    "Optimised Hedge": OptimisedForwardHedging,
+}
+
+
+def benchmark_model(n_paths, **options):
+    return HestonModel(
+        S0=BENCHMARK_PARAMS["S0"], params=BENCHMARK_PARAMS, n_paths=n_paths, **options
+    )
+
+
+def cash_flow_paths(n_paths):
+    """Spot at the cash-flow dates and the forward rates used by main"""
+    _, times_to_cf = case_study.getKeyDates()
+    model = benchmark_model(n_paths)
+    _, spot_at_cf_dates, _ = model.simulate(max(times_to_cf), observation_times=times_to_cf)
+    return spot_at_cf_dates, case_study.getForwardRates(BENCHMARK_PARAMS), times_to_cf
+
+
+def bench_simulate(n_paths, horizon):
+    model = benchmark_model(n_paths)
+    return lambda: model.simulate(horizon)
+
+
+def bench_simulate_qe(n_paths, horizon):
+    model = benchmark_model(n_paths, scheme="qe")
+    return lambda: model.simulate(horizon)
+
+
+def bench_option_price(n_paths, horizon):
+    model = benchmark_model(n_paths)
+    return lambda: model.calculate_option_price(BENCHMARK_PARAMS["S0"], horizon)
+
+
+def bench_option_price_analytic(n_paths, horizon):
+    model = benchmark_model(n_paths)
+    return lambda: model.calculate_option_price_analytic(BENCHMARK_PARAMS["S0"], horizon)
+
+
+def bench_calibrate(n_paths, horizon):
+    dataset = case_study.getDataset()
+    initial_params = case_study.getInitialParameters(dataset)
+    market_data = case_study.getMarketData(dataset, initial_params)
+
+    def calibrate():
+        model = HestonModel(S0=initial_params["S0"], params=dict(initial_params))
+        model.calibrate(market_data)
+
+    return calibrate
+
+
+def bench_implied_vol(n_paths, horizon):
+    """Invert a 100 x 100 strike x maturity grid of Heston prices"""
+    model = benchmark_model(n_paths)
+    T = np.linspace(0.1, horizon, 100)
+    K = BENCHMARK_PARAMS["S0"] * np.exp(np.linspace(-0.3, 0.3, 100)[:, None] * np.sqrt(T))
+    prices = model.calculate_option_price_analytic(K, T)
+    rf = model.rd - model.mu
+    return lambda: implied_volatility(prices, model.S0, K, T, model.rd, rf)
+
+
+def bench_irr(n_paths, horizon):
+    spot_at_cf_dates, forward_rates, times_to_cf = cash_flow_paths(n_paths)
+    usd_cf = NoHedging(case_study.cash_flows_eur).calculate_usd_cf(
+        spot_at_cf_dates, forward_rates
+    )
+    return lambda: calculate_irr(usd_cf, times_to_cf)
+
+
+def bench_usd_cf(strategy):
+    def bench(n_paths, horizon):
+        spot_at_cf_dates, forward_rates, _ = cash_flow_paths(n_paths)
+        hedge = STRATEGIES[strategy](case_study.cash_flows_eur)
+        return lambda: hedge.calculate_usd_cf(spot_at_cf_dates, forward_rates)
+
+    return bench
+
+
+def bench_var_cvar(n_paths, horizon):
+    spot_at_cf_dates, forward_rates, times_to_cf = cash_flow_paths(n_paths)
+    usd_cf = NoHedging(case_study.cash_flows_eur).calculate_usd_cf(
+        spot_at_cf_dates, forward_rates
+    )
+    irr = calculate_irr(usd_cf, times_to_cf)
+    return lambda: (calculate_var(irr), calculate_cvar(irr))
+
+
+def bench_tail_scenarios(n_paths, horizon):
+    spot_at_cf_dates, forward_rates, times_to_cf = cash_flow_paths(n_paths)
+    irrs = np.stack(
+        [
+            solve_irr(
+                STRATEGIES[strategy](case_study.cash_flows_eur).calculate_usd_cf(
+                    spot_at_cf_dates, forward_rates
+                ),
+                times_to_cf,
+            )[0]
+            for strategy in ("No Hedge", "Partial Hedge", "Dynamic Delta Hedge")
+        ]
+    )
+    return lambda: select_tail_paths(irrs)
+
+
+def bench_rebalanced_hedge(n_paths, horizon):
+    """Daily rebalancing streamed alongside the simulation"""
+    model = benchmark_model(n_paths)
+    times_to_cf = np.linspace(horizon / 5, horizon, 5)
+    cash_flows = dict(zip(range(5), [-10e6, 1e6, 1e6, 1e6, 11e6]))
+    forward_rates = dict(
+        zip(
+            range(5),
+            BENCHMARK_PARAMS["S0"]
+            * np.exp((BENCHMARK_PARAMS["usd_ir"] - BENCHMARK_PARAMS["eur_ir"]) * times_to_cf),
+        )
+    )
+    hedge = RebalancedDeltaHedging(cash_flows, band=0.05, half_spread=0.0003)
+    return lambda: hedge.simulate_usd_cf(model, forward_rates, times_to_cf)
+
+
+def bench_sensitivities(n_paths, horizon):
+    """Every parameter bump simulated in one batched pass"""
+    model = benchmark_model(n_paths)
+    _, times_to_cf = case_study.getKeyDates()
+    forward_rates = case_study.getForwardRates(BENCHMARK_PARAMS)
+    training_spot = case_study.simulateTrainingPaths(model, times_to_cf)
+    build = lambda spot: case_study.buildStrategies(
+        case_study.cash_flows_eur, spot, forward_rates, times_to_cf, training_spot
+    )
+    return lambda: parameter_sensitivities(model, build, times_to_cf)
+
+
+def bench_pipeline(n_paths, horizon):
+    """
+    The full main.py flow with the default options, run from a scratch
+    directory holding a copy of the market data so the calibration cache and
+    derived features it writes stay out of the working tree. Repeats after
+    the first hit that cache, as a second run of main.py would.
+    """
+    scratch = tempfile.TemporaryDirectory(prefix="bench-pipeline-")
+    (Path(scratch.name) / "data").mkdir()
+    shutil.copy(ROOT / "data" / "market_data.csv", Path(scratch.name) / "data")
+
+    def pipeline():
+        cwd = os.getcwd()
+        os.chdir(scratch.name)
+        try:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                main.main([])
+        finally:
+            os.chdir(cwd)
+
+    # Removed with the case's process, not after the first call
+    pipeline.scratch = scratch
+    return pipeline
+
+
+def bench_startup(n_paths, horizon):
+    """A fresh interpreter importing main and parsing its arguments"""
+    command = [sys.executable, "-c", "import main; main.parseArguments([])"]
+    return lambda: subprocess.run(command, check=True)
+
+
+CASES = {
+    "simulate": bench_simulate,
+    "simulate_qe": bench_simulate_qe,
+    "option_price": bench_option_price,
+    "option_price_analytic": bench_option_price_analytic,
+    "calibrate": bench_calibrate,
+    "implied_vol": bench_implied_vol,
+    "irr": bench_irr,
+    **{f"usd_cf[{strategy}]": bench_usd_cf(strategy) for strategy in STRATEGIES},
+    "var_cvar": bench_var_cvar,
+    "tail_scenarios": bench_tail_scenarios,
+    "rebalanced_hedge": bench_rebalanced_hedge,
+    "sensitivities": bench_sensitivities,
+    "pipeline": bench_pipeline,
+    "startup": bench_startup,
+}
+
+SCALES = {
+    "simulate": ("paths", "horizon"),
+    "simulate_qe": ("paths", "horizon"),
+    "option_price": ("paths", "horizon"),
+    "option_price_analytic": ("horizon",),
+    "calibrate": (),
+    "implied_vol": ("horizon",),
+    "irr": ("paths",),
+    **{f"usd_cf[{strategy}]": ("paths",) for strategy in STRATEGIES},
+    "var_cvar": ("paths",),
+    "tail_scenarios": ("paths",),
+    "rebalanced_hedge": ("paths", "horizon"),
+    "sensitivities": ("paths",),
+    "pipeline": (),
+    "startup": (),
+}
+
+# Absolute wall-time limits (seconds), checked with or without a baseline.
+# The headless compute path must not pull in plotting or scipy at import.
+BUDGETS = {
+    "startup": 0.5,
+}
@@ -0,0 +1,184 @@
+"""
+Run the benchmark suite and compare against a stored baseline.
+
+    python -m benchmarks.run --paths 10000 100000 --horizons 1 5
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run --cases simulate irr --repeat 5
+
+Every case runs in a fresh process. Its peak_rss_mb is that process's
+whole-lifetime peak (imports, setup and the timed runs; child processes
+such as the startup case's interpreter are not counted) and rss_growth_mb
+is how far the timed runs pushed the peak above where setup left it. Seeds are
+fixed by the model (random_seed = 42), so runs are comparable. Results are
+written as JSON; with a baseline present, any case whose best wall time or
+peak RSS grew by more than the tolerance is flagged and the exit code is 1.
+Cases with an absolute budget in cases.BUDGETS (e.g. the startup time of
+main.py) fail whenever they exceed it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = ROOT / "benchmarks" / "baseline.json"
+RESULTS = ROOT / "benchmarks" / "results"
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_case(name, n_paths, horizon, repeat):
+    """Set up and time one case (called in its own process)"""
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    from benchmarks.cases import CASES, SCALES
+
+    benchmark = CASES[name](n_paths, horizon)
+    setup_rss = peak_rss_mb()
+
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        benchmark()
+        wall_times.append(time.perf_counter() - start)
+
+    peak_rss = peak_rss_mb()
+    result = {
+        "case": name,
+        "n_paths": n_paths if "paths" in SCALES[name] else None,
+        "horizon": horizon if "horizon" in SCALES[name] else None,
+        "repeat": repeat,
+        "wall_best": min(wall_times),
+        "wall_median": float(np.median(wall_times)),
+        "peak_rss_mb": peak_rss,
+        "rss_growth_mb": peak_rss - setup_rss,
+    }
+    if result["n_paths"]:
+        result["paths_per_sec"] = n_paths / result["wall_best"]
+
+    return result
+
+
+def case_key(result):
+    return f"{result['case']}|paths={result['n_paths']}|horizon={result['horizon']}"
+
+
+def benchmark_grid(cases, path_counts, horizons):
+    """Expand each case over the parameters it depends on"""
+    from benchmarks.cases import SCALES
+
+    grid = []
+    for name in cases:
+        scales = SCALES[name]
+        paths = path_counts if "paths" in scales else [path_counts[0]]
+        times = horizons if "horizon" in scales else [horizons[0]]
+        grid += [(name, n_paths, horizon) for n_paths, horizon in product(paths, times)]
+    return grid
+
+
+def compare(results, baseline, tolerance):
+    """Cases whose wall time or peak RSS regressed beyond the tolerance"""
+    previous = {case_key(result): result for result in baseline["results"]}
+
+    regressions = []
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        for metric in ("wall_best", "peak_rss_mb"):
+            ratio = result[metric] / old[metric]
+            result[f"{metric}_ratio"] = ratio
+            if ratio > 1 + tolerance:
+                regressions.append((case_key(result), metric, ratio))
+    return regressions
+
+
+def over_budget(results):
+    """Cases whose best wall time exceeds their absolute budget"""
+    from benchmarks.cases import BUDGETS
+
+    return [
+        (case_key(result), "budget", result["wall_best"] / BUDGETS[result["case"]])
+        for result in results
+        if result["case"] in BUDGETS and result["wall_best"] > BUDGETS[result["case"]]
+    ]
+
+
+def main():
+    from benchmarks.cases import CASES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--paths", nargs="+", type=int, default=[10000, 50000])
+    parser.add_argument("--horizons", nargs="+", type=float, default=[1.0, 5.0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    spawn = get_context("spawn")
+    results = []
+    for name, n_paths, horizon in benchmark_grid(args.cases, args.paths, args.horizons):
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            result = pool.submit(run_case, name, n_paths, horizon, args.repeat).result()
+        results.append(result)
+        throughput = (
+            f"{result['paths_per_sec']:12.0f} paths/s" if "paths_per_sec" in result else ""
+        )
+        print(
+            f"{case_key(result):55s} {result['wall_best']:9.4f}s "
+            f"{result['peak_rss_mb']:8.1f}MB (+{result['rss_growth_mb']:.1f}MB) {throughput}"
+        )
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+    regressions = over_budget(results)
+    if args.baseline.is_file() and not args.save_baseline:
+        with open(args.baseline) as file:
+            regressions += compare(results, json.load(file), args.tolerance)
+        if not regressions:
+            print(f"No regressions against {args.baseline}")
+    for key, metric, ratio in regressions:
+        print(f"REGRESSION {key} {metric} x{ratio:.2f}")
+    report["regressions"] = [
+        {"case": key, "metric": metric, "ratio": ratio}
+        for key, metric, ratio in regressions
+    ]
+
+    output = args.output or RESULTS / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    if args.save_baseline:
+        output = args.baseline
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
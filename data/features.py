@@ -0,0 +1,210 @@
+"""
+Derived market features, built from data/market_data.csv.
+
+    from data.features import update_features
+
+    dataset = update_features()
+
+The first call derives every feature column over the whole history and
+writes data/derived/processed_data.csv plus a binary cache. Later calls read
+only the bytes appended to market_data.csv since then, derive the new rows
+from the saved state (the last WINDOW raw rows for the returns and rolling
+vols, the running products and their peaks) and append them to both outputs,
+so a daily update costs O(new rows). If the bytes just before the saved
+offset have changed (the file was rewritten rather than appended to),
+everything is rebuilt.
+
+data/derived/ is untracked. The committed data/processed_data.csv is the
+notebook's snapshot, without the 1M realised vol and wealth index columns
+derived here; this module never writes it.
+"""
+
+import io
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MARKET_FILE = "data/market_data.csv"
+PROCESSED_FILE = "data/derived/processed_data.csv"
+CACHE_FILE = "data/derived/features_cache.pkl"
+
+WINDOW = 252  # 1Y realised vol
+SHORT_WINDOW = 21  # 1M realised vol
+CHECK_BYTES = 256  # bytes before the saved offset that must be unchanged
+
+
+def derive_features(market, context=None, running=None):
+    """
+    Feature columns of the market rows, in the processed_data.csv layout
+    (market columns, derived columns, Date last).
+
+    context holds the raw rows preceding market (at least WINDOW of them for
+    exact rolling vols), and running the products and peaks at the last
+    context row (see _running); None starts them afresh.
+    """
+    running = running or {}
+    n_context = 0 if context is None else len(context)
+    frame = market if context is None else pd.concat([context, market], ignore_index=True)
+    frame = frame.reset_index(drop=True)
+    mid = frame["EURUSD_Spot_MID"]
+
+    features = frame.drop(columns="Date")
+    features["EURUSD_Spot_SPREAD"] = frame["EURUSD_Spot_ASK"] - frame["EURUSD_Spot_BID"]
+    features["EURUSD_Spot_RETURNS"] = mid.pct_change()
+    features["EURUSD_Spot_LOG_RETURNS"] = np.log(mid / mid.shift())
+    features["EURUSD_1Y_ATM_Spread"] = (
+        frame["EURUSD_1Y_ATM_VOL_ASK"] - frame["EURUSD_1Y_ATM_VOL_BID"]
+    )
+    features["EURUSD_5Y_ATM_Spread"] = (
+        frame["EURUSD_5Y_ATM_VOL_ASK"] - frame["EURUSD_5Y_ATM_VOL_BID"]
+    )
+    features["EURUSD_5Y_ATM_VOL_STRUCT"] = (
+        frame["EURUSD_5Y_ATM_VOL_MID"] - frame["EURUSD_1Y_ATM_VOL_MID"]
+    )
+    log_returns = features["EURUSD_Spot_LOG_RETURNS"]
+    features["EURUSD_1Y_REALISED_VOL"] = log_returns.rolling(WINDOW).std() * np.sqrt(252)
+    features["EURUSD_1M_REALISED_VOL"] = log_returns.rolling(SHORT_WINDOW).std() * np.sqrt(
+        252
+    )
+
+    features = features.iloc[n_context:].reset_index(drop=True)
+
+    # The notebook's columns: cumprod(returns) + 1, its peak and drawdown.
+    # The product of returns vanishes within a few rows, so the wealth index
+    # cumprod(1 + returns) and its drawdown are kept alongside.
+    returns = features["EURUSD_Spot_RETURNS"]
+    product = running.get("product", 1.0) * returns.cumprod()
+    cumulative = product + 1
+    peak = np.fmax(cumulative.cummax(), running.get("peak", np.nan))
+    features["EURUSD_SPOT_CUMULATIVE"] = cumulative
+    features["EURUSD_SPOT_PEAK"] = peak
+    features["EURUSD_SPOT_DRAWDOWN"] = (cumulative - peak) / peak
+
+    wealth = running.get("wealth", 1.0) * (1 + returns).cumprod()
+    wealth_peak = np.fmax(wealth.cummax(), running.get("wealth_peak", np.nan))
+    features["EURUSD_SPOT_WEALTH"] = wealth
+    features["EURUSD_SPOT_WEALTH_DRAWDOWN"] = wealth / wealth_peak - 1
+    features["Date"] = frame["Date"].iloc[n_context:].to_numpy()
+
+    return features
+
+
+def _running(features, running=None):
+    """
+    Running products and peaks after the last feature row, carried over from
+    running where the rows have no returns yet. NaN peaks mean no value has
+    been seen, so the first valid value seeds them.
+    """
+    running = dict(
+        running or {"product": 1.0, "peak": np.nan, "wealth": 1.0, "wealth_peak": np.nan}
+    )
+    returns = features["EURUSD_Spot_RETURNS"].dropna()
+    if len(returns):
+        running["product"] *= returns.cumprod().iloc[-1]
+        running["wealth"] *= (1 + returns).cumprod().iloc[-1]
+        running["peak"] = np.fmax(running["peak"], features["EURUSD_SPOT_PEAK"].max())
+        running["wealth_peak"] = np.fmax(
+            running["wealth_peak"], features["EURUSD_SPOT_WEALTH"].max()
+        )
+    return running
+
+
+def _state(market, features, offset, head, running=None):
+    """What the next incremental update needs, besides the features"""
+    return {
+        "columns": list(market.columns),
+        "context": market.iloc[-WINDOW:].reset_index(drop=True),
+        "running": _running(features, running),
+        "offset": offset,
+        "check": head[-CHECK_BYTES:],
+    }
+
+
+def _read_new_rows(market_file, state):
+    """
+    Raw rows appended since the saved offset, with the new offset, or None
+    when the file no longer starts with the bytes the cache was built from
+    """
+    with open(market_file, "rb") as file:
+        start = state["offset"] - len(state["check"])
+        if start < 0:
+            return None
+        file.seek(start)
+        if file.read(len(state["check"])) != state["check"]:
+            return None
+        tail = file.read()
+
+    # Leave a half-written last line for the next update
+    tail = tail[: tail.rfind(b"\n") + 1]
+    offset = state["offset"] + len(tail)
+    if not tail.strip():
+        return pd.DataFrame(columns=state["columns"]), offset, tail
+
+    rows = pd.read_csv(io.BytesIO(tail), header=None, names=state["columns"])
+    return rows, offset, tail
+
+
+def build_features(market_file=MARKET_FILE, processed_file=PROCESSED_FILE, cache_file=CACHE_FILE):
+    """Derive every feature over the whole history and reset the cache"""
+    with open(market_file, "rb") as file:
+        raw = file.read()
+    market = pd.read_csv(io.BytesIO(raw))
+    features = derive_features(market)
+
+    Path(processed_file).parent.mkdir(parents=True, exist_ok=True)
+    Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+    features.to_csv(processed_file, index=False)
+    _save_cache(cache_file, features, _state(market, features, len(raw), raw))
+    print(f"Built {len(features)} feature rows from {market_file}")
+    return features
+
+
+def update_features(market_file=MARKET_FILE, processed_file=PROCESSED_FILE, cache_file=CACHE_FILE):
+    """
+    Features of every date in market_file, appending only the rows added
+    since the last call. Falls back to build_features on a missing or stale
+    cache.
+    """
+    try:
+        with open(cache_file, "rb") as file:
+            cache = pickle.load(file)
+        new = _read_new_rows(market_file, cache["state"])
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+        new = None
+    if new is None or not Path(processed_file).exists():
+        return build_features(market_file, processed_file, cache_file)
+
+    rows, offset, tail = new
+    state, features = cache["state"], cache["features"]
+    if rows.empty:
+        return features
+
+    appended = derive_features(rows, state["context"], state["running"])
+    appended.to_csv(processed_file, mode="a", header=False, index=False)
+
+    features = pd.concat([features, appended], ignore_index=True)
+    context = pd.concat([state["context"], rows], ignore_index=True)
+    _save_cache(
+        cache_file,
+        features,
+        _state(
+            context,
+            appended,
+            offset,
+            state["check"] + tail,
+            state["running"],
+        ),
+    )
+    print(f"Appended {len(appended)} feature rows from {market_file}")
+    return features
+
+
+def _save_cache(cache_file, features, state):
+    with open(cache_file, "wb") as file:
+        pickle.dump({"features": features, "state": state}, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+if __name__ == "__main__":
+    build_features()
@@ -0,0 +1,85 @@
+import pandas as pd
+from data.features import MARKET_FILE, build_features, update_features
+
+with open(MARKET_FILE, "rb") as file:
+    LINES = file.read().splitlines(keepends=True)
+
+
+def paths(directory):
+    return {
+        "market_file": directory / "market_data.csv",
+        "processed_file": directory / "derived" / "processed_data.csv",
+        "cache_file": directory / "derived" / "features_cache.pkl",
+    }
+
+
+def write(path, lines, mode="wb"):
+    with open(path, mode) as file:
+        file.write(b"".join(lines))
+
+
+def assert_matches_full_build(features, files, tmp_path):
+    """Same frame, and same processed file, as one build over the whole file"""
+    full = paths(tmp_path / "full")
+    full["market_file"].parent.mkdir()
+    full["market_file"].write_bytes(files["market_file"].read_bytes())
+    expected = build_features(**full)
+
+    pd.testing.assert_frame_equal(features, expected, check_dtype=False, rtol=1e-12)
+    pd.testing.assert_frame_equal(
+        pd.read_csv(files["processed_file"]),
+        pd.read_csv(full["processed_file"]),
+        rtol=1e-12,
+    )
+
+
+def test_appended_rows_match_a_full_build(tmp_path, capsys):
+    files = paths(tmp_path)
+    write(files["market_file"], LINES[:600])
+    assert len(update_features(**files)) == 599
+    assert "Built" in capsys.readouterr().out
+
+    # Two appends, the first shorter than the rolling window
+    write(files["market_file"], LINES[600:650], "ab")
+    update_features(**files)
+    write(files["market_file"], LINES[650:], "ab")
+    features = update_features(**files)
+    assert "Appended" in capsys.readouterr().out
+    assert len(features) == len(LINES) - 1
+
+    # Nothing new: served from the cache
+    assert update_features(**files).equals(features)
+    assert capsys.readouterr().out == ""
+
+    assert_matches_full_build(features, files, tmp_path)
+
+
+def test_rewritten_history_is_rebuilt(tmp_path, capsys):
+    files = paths(tmp_path)
+    write(files["market_file"], LINES[:800])
+    update_features(**files)
+
+    # A revised last row before the saved offset, then new rows
+    revised = LINES[799].replace(b",", b",9", 1)
+    write(files["market_file"], LINES[:799] + [revised] + LINES[800:900])
+    capsys.readouterr()
+    features = update_features(**files)
+    assert "Built" in capsys.readouterr().out
+
+    assert_matches_full_build(features, files, tmp_path)
+
+
+def test_half_written_line_waits_for_the_next_update(tmp_path):
+    files = paths(tmp_path)
+    write(files["market_file"], LINES[:700])
+    update_features(**files)
+
+    head, rest = LINES[710][:20], LINES[710][20:]
+    write(files["market_file"], LINES[700:710] + [head], "ab")
+    assert len(update_features(**files)) == 709
+
+    write(files["market_file"], [rest] + LINES[711:720], "ab")
+    features = update_features(**files)
+    assert len(features) == 719
+
+    assert_matches_full_build(features, files, tmp_path)
@@ -1,6 +1,6 @@
 import numpy as np
 from helpers.delta_strikes import calculate_25delta_strikes
-from scipy.stats import norm
+from scipy.special import ndtr
 
 
 def black_scholes_price(S, K, T, sigma, r, q, option_type="call"):
@@ -9,9 +9,9 @@ def black_scholes_price(S, K, T, sigma, r, q, option_type="call"):
     d2 = d1 - sigma * np.sqrt(T)
 
     if option_type == "call":
-        price = S * np.exp(-q * T) * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+        price = S * np.exp(-q * T) * ndtr(d1) - K * np.exp(-r * T) * ndtr(d2)
     else:
-        price = K * np.exp(-r * T) * norm.cdf(-d2) - S * np.exp(-q * T) * norm.cdf(-d1)
+        price = K * np.exp(-r * T) * ndtr(-d2) - S * np.exp(-q * T) * ndtr(-d1)
 
     return price
 
@@ -0,0 +1,265 @@
+"""
+Stage timers, allocation tracking and optional cProfile capture.
+
+    from helpers import instrumentation
+
+    instrumentation.enable(trace_memory=True, profile=["calibrate"])
+    with instrumentation.stage("calibrate"):
+        ...
+    instrumentation.report("reports/run.json")
+
+While disabled, stage() hands back a shared no-op context manager and no
+project function is wrapped, so the cost is one flag check per stage.
+enable() also wraps every function and method defined in model/,
+strategies/, metrics/ and helpers/ (and the references other modules hold
+to them), so the report breaks each stage down by function. disable()
+restores the originals. Work done in worker processes is not recorded.
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+PACKAGES = ("model", "strategies", "metrics", "helpers")
+
+_NO_OP = nullcontext()
+
+
+class _Recorder:
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.profile = ()
+        self.profile_dir = None
+        self.records = {}
+        self.stack = []
+        self.patched = []
+        self.started = None
+
+    def record(self, path):
+        if path not in self.records:
+            self.records[path] = {
+                "calls": 0,
+                "wall_total": 0.0,
+                "wall_max": 0.0,
+                "alloc_peak": 0,
+            }
+        return self.records[path]
+
+
+_recorder = _Recorder()
+
+
+class _Stage:
+    """Times one stage, nested under the stages already open"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        parents = [frame["name"] for frame in _recorder.stack]
+        self.path = "/".join(parents + [self.name])
+        self.peak = 0
+        # Registering on entry lists parents before their children
+        _recorder.record(self.path)
+
+        if _recorder.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Fold the running peak into the parent before resetting it
+            if _recorder.stack:
+                parent = _recorder.stack[-1]["stage"]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = current
+
+        self.profiler = None
+        if self.name in _recorder.profile and _recorder.profile_dir is not None:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Another profiler is already running (nested stage)
+                self.profiler = None
+
+        _recorder.stack.append({"name": self.name, "stage": self})
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        _recorder.stack.pop()
+
+        record = _recorder.record(self.path)
+        record["calls"] += 1
+        record["wall_total"] += elapsed
+        record["wall_max"] = max(record["wall_max"], elapsed)
+
+        if _recorder.trace_memory:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            record["alloc_peak"] = max(record["alloc_peak"], peak - self.memory_start)
+            if _recorder.stack:
+                parent = _recorder.stack[-1]["stage"]
+                parent.peak = max(parent.peak, peak)
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            profile_path = _recorder.profile_dir / f"{self.path.replace('/', '.')}.prof"
+            self.profiler.dump_stats(profile_path)
+            record["profile"] = str(profile_path)
+            record["profile_top"] = _top_functions(self.profiler)
+
+        return False
+
+
+def _top_functions(profiler, n=10):
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream).sort_stats("cumulative")
+    return [
+        {
+            "function": f"{file}:{line}({name})",
+            "calls": calls,
+            "cumulative": cumulative,
+        }
+        for (file, line, name), (_, calls, _, cumulative, _) in sorted(
+            stats.stats.items(), key=lambda item: -item[1][3]
+        )[:n]
+    ]
+
+
+def stage(name):
+    """Context manager timing a named stage (a no-op while disabled)"""
+    if not _recorder.enabled:
+        return _NO_OP
+    return _Stage(name)
+
+
+def _project_modules():
+    for module_name, module in list(sys.modules.items()):
+        if module_name.split(".")[0] in PACKAGES and module_name != __name__:
+            yield module
+
+
+def _instrument_functions():
+    """Wrap the project's functions and methods, and repoint references"""
+    originals = {}
+
+    def wrappable(function):
+        # A generator's body runs after the call returns, so timing the call
+        # would measure nothing
+        return inspect.isfunction(function) and not inspect.isgeneratorfunction(function)
+
+    def wrap(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _Stage(function.__qualname__):
+                return function(*args, **kwargs)
+
+        originals[id(function)] = wrapper
+        return wrapper
+
+    for module in _project_modules():
+        for attr, value in list(vars(module).items()):
+            if wrappable(value) and value.__module__ == module.__name__:
+                _recorder.patched.append((module, attr, value))
+                setattr(module, attr, wrap(value))
+            elif inspect.isclass(value) and value.__module__ == module.__name__:
+                for method_name, method in list(vars(value).items()):
+                    if method_name.startswith("__"):
+                        continue
+                    if wrappable(method):
+                        wrapped = wrap(method)
+                    elif isinstance(method, staticmethod) and wrappable(method.__func__):
+                        wrapped = staticmethod(wrap(method.__func__))
+                    elif isinstance(method, classmethod) and wrappable(method.__func__):
+                        wrapped = classmethod(wrap(method.__func__))
+                    else:
+                        continue
+                    _recorder.patched.append((value, method_name, method))
+                    setattr(value, method_name, wrapped)
+
+    # Names imported elsewhere (e.g. "from metrics.IRR import calculate_irr")
+    for module in list(sys.modules.values()):
+        if module is None or module.__name__ == __name__:
+            continue
+        for attr, value in list(vars(module).items()):
+            if not inspect.isfunction(value) or attr != value.__name__:
+                continue
+            wrapper = originals.get(id(value))
+            if wrapper is not None and wrapper is not value:
+                _recorder.patched.append((module, attr, value))
+                setattr(module, attr, wrapper)
+
+
+def enable(trace_memory=False, profile=(), profile_dir="reports/profiles", functions=True):
+    """
+    Start recording. profile names the stages to capture with cProfile;
+    functions wraps every project function as its own stage.
+    """
+    _recorder.enabled = True
+    _recorder.trace_memory = trace_memory
+    _recorder.profile = tuple(profile)
+    _recorder.profile_dir = Path(profile_dir) if profile else None
+    _recorder.records = {}
+    _recorder.started = datetime.now()
+
+    if _recorder.profile_dir is not None:
+        _recorder.profile_dir.mkdir(parents=True, exist_ok=True)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if functions:
+        _instrument_functions()
+
+
+def disable():
+    """Stop recording and restore every wrapped function"""
+    for owner, attr, original in reversed(_recorder.patched):
+        setattr(owner, attr, original)
+    _recorder.patched = []
+
+    if _recorder.trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _recorder.enabled = False
+
+
+def summary():
+    """Per-stage records, in the order the stages were first entered"""
+    return {
+        "started": _recorder.started.isoformat() if _recorder.started else None,
+        "trace_memory": _recorder.trace_memory,
+        "stages": [{"stage": path, **record} for path, record in _recorder.records.items()],
+    }
+
+
+def report(path=None, min_wall=0.001):
+    """Print a console summary and optionally write the full report as JSON"""
+    run = summary()
+
+    print(f"{'Stage':70s} {'Calls':>7s} {'Total (s)':>10s} {'Max (s)':>9s} {'Alloc (MB)':>11s}")
+    for record in run["stages"]:
+        if record["wall_total"] < min_wall:
+            continue
+        depth = record["stage"].count("/")
+        name = "  " * depth + record["stage"].rsplit("/", 1)[-1]
+        alloc = f"{record['alloc_peak'] / 2**20:11.1f}" if run["trace_memory"] else f"{'':11s}"
+        print(
+            f"{name[:70]:70s} {record['calls']:7d} {record['wall_total']:10.4f} "
+            f"{record['wall_max']:9.4f} {alloc}"
+        )
+
+    if path is not None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(run, file, indent=2)
+        print(f"Instrumentation report written to {path}")
+
+    return run
@@ -0,0 +1,65 @@
+import numpy as np
+from helpers.fx_options import (
+    garman_kohlhagen_greeks,
+    garman_kohlhagen_price,
+    implied_volatility,
+    strike_from_delta,
+)
+
+S, T, SIGMA, RD, RF = 1.1, 1.0, 0.1, 0.035, 0.0215
+STRIKES = np.array([0.9, 1.0, 1.1, 1.2, 1.4])
+
+
+def test_greeks_match_central_differences():
+    for option_type in ("call", "put"):
+        greeks = garman_kohlhagen_greeks(S, STRIKES, T, SIGMA, RD, RF, option_type)
+
+        def price(S=S, T=T, sigma=SIGMA):
+            return garman_kohlhagen_price(S, STRIKES, T, sigma, RD, RF, option_type)
+
+        h = 1e-4
+        assert np.allclose(greeks["price"], price())
+        assert np.allclose(greeks["delta_spot"], (price(S=S + h) - price(S=S - h)) / (2 * h))
+        assert np.allclose(
+            greeks["gamma"], (price(S=S + h) - 2 * price() + price(S=S - h)) / h**2, rtol=1e-5
+        )
+        assert np.allclose(greeks["vega"], (price(sigma=SIGMA + h) - price(sigma=SIGMA - h)) / (2 * h))
+        assert np.allclose(greeks["theta"], -(price(T=T + h) - price(T=T - h)) / (2 * h))
+
+        # Forward delta: dV/dF per unit of the forward, undiscounted
+        assert np.allclose(greeks["delta_forward"], greeks["delta_spot"] * np.exp(RF * T))
+
+
+def test_strike_from_delta_recovers_the_delta():
+    for convention, key in (("spot", "delta_spot"), ("forward", "delta_forward")):
+        K_call = strike_from_delta(0.25, S, T, SIGMA, RD, RF, "call", convention)
+        K_put = strike_from_delta(0.25, S, T, SIGMA, RD, RF, "put", convention)
+
+        assert np.isclose(garman_kohlhagen_greeks(S, K_call, T, SIGMA, RD, RF, "call")[key], 0.25)
+        assert np.isclose(garman_kohlhagen_greeks(S, K_put, T, SIGMA, RD, RF, "put")[key], -0.25)
+        assert K_put < S < K_call
+
+
+def test_implied_volatility_round_trip():
+    K = S * np.exp(np.linspace(-0.5, 0.5, 41))[:, None]
+    maturities = np.array([0.1, 1.0, 5.0])
+    sigma = np.linspace(0.03, 0.6, 41)[:, None]
+    option_type = np.where(K >= S, "call", "put")
+
+    for types in (option_type, "call", "put"):
+        greeks = garman_kohlhagen_greeks(S, K, maturities, sigma, RD, RF, types)
+        implied = implied_volatility(greeks["price"], S, K, maturities, RD, RF, types)
+
+        # Where vega vanishes the price carries no volatility information;
+        # elsewhere the volatility itself is recovered
+        identified = greeks["vega"] > 1e-6
+        assert identified.mean() > 0.8
+        assert np.allclose(implied[identified], np.broadcast_to(sigma, implied.shape)[identified], rtol=1e-8)
+        repriced = garman_kohlhagen_price(S, K, maturities, implied, RD, RF, types)
+        solved = ~np.isnan(implied)
+        assert solved[identified].all()
+        assert np.allclose(repriced[solved], greeks["price"][solved], rtol=1e-8, atol=1e-12)
+
+    # Prices outside the no-arbitrage bounds have no implied volatility
+    assert np.isnan(implied_volatility(-0.01, S, 1.0, T, RD, RF))
+    assert np.isnan(implied_volatility(S, S, 1.0, T, RD, RF))
@@ -0,0 +1,48 @@
+import json
+import numpy as np
+from helpers import instrumentation
+from metrics import Sensitivity, VAR
+from metrics.Streaming import RunningMoments
+
+
+def test_disable_restores_wrapped_functions():
+    originals = (VAR.calculate_var, Sensitivity.calculate_var, RunningMoments.update)
+
+    instrumentation.enable()
+    try:
+        # Wrapped where defined, where imported by name, and on classes
+        assert VAR.calculate_var is not originals[0]
+        assert Sensitivity.calculate_var is VAR.calculate_var
+        assert RunningMoments.update is not originals[2]
+        assert VAR.calculate_var.__wrapped__ is originals[0]
+    finally:
+        instrumentation.disable()
+
+    assert (VAR.calculate_var, Sensitivity.calculate_var, RunningMoments.update) == originals
+    assert instrumentation.stage("idle") is instrumentation._NO_OP
+
+
+def test_report_nests_function_calls_under_stages(tmp_path, capsys):
+    returns = np.random.default_rng(0).normal(size=1000)
+
+    instrumentation.enable()
+    try:
+        with instrumentation.stage("metrics"):
+            for _ in range(3):
+                VAR.calculate_cvar(returns)
+        with instrumentation.stage("metrics"):
+            VAR.calculate_var(returns)
+        run = instrumentation.report(tmp_path / "run.json", min_wall=0)
+    finally:
+        instrumentation.disable()
+
+    with open(tmp_path / "run.json") as file:
+        assert json.load(file) == run
+    calls = {record["stage"]: record["calls"] for record in run["stages"]}
+    assert calls == {
+        "metrics": 2,
+        "metrics/calculate_cvar": 3,
+        "metrics/calculate_cvar/calculate_var": 3,
+        "metrics/calculate_var": 1,
+    }
+    assert "report written" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def pair_antithetic(samples):
+    """Average adjacent antithetic pairs (paths 2i and 2i + 1) on the last axis"""
+    samples = np.asarray(samples, dtype=float)
+    return samples.reshape(*samples.shape[:-1], -1, 2).mean(axis=-1)
+
+
+def monte_carlo_estimate(
+    samples,
+    controls=None,
+    control_means=None,
+    antithetic=False,
+    replicate_sizes=None,
+):
+    """
+    Monte Carlo mean and standard error over the last axis of samples.
+
+    controls has shape samples.shape + (n_controls,) and control_means the
+    matching known expectations. The control coefficients are fitted by least
+    squares per estimate. With antithetic the paths are paired up first, so
+    the standard error reflects the pairing. With replicate_sizes (independent
+    randomised QMC scrambles laid out contiguously) the standard error comes
+    from the spread of the replicate means.
+    """
+    samples = np.asarray(samples, dtype=float)
+
+    if antithetic:
+        samples = pair_antithetic(samples)
+        if controls is not None:
+            controls = np.moveaxis(pair_antithetic(np.moveaxis(controls, -1, 0)), 0, -1)
+
+    n = samples.shape[-1]
+
+    if controls is None:
+        adjusted = samples
+        n_fitted = 0
+    else:
+        adjusted, n_fitted = _apply_controls(samples, controls, control_means)
+
+    estimate = adjusted.mean(axis=-1)
+
+    if replicate_sizes is not None:
+        boundaries = np.cumsum(replicate_sizes)[:-1]
+        replicate_means = np.stack(
+            [r.mean(axis=-1) for r in np.split(adjusted, boundaries, axis=-1)], axis=-1
+        )
+        stderr = replicate_means.std(axis=-1, ddof=1) / np.sqrt(len(replicate_sizes))
+    else:
+        stderr = adjusted.std(axis=-1, ddof=1 + n_fitted) / np.sqrt(n)
+
+    return estimate, stderr
+
+
+def _apply_controls(samples, controls, control_means):
+    """Subtract the fitted control variate adjustment from the samples"""
+    control_means = np.asarray(control_means, dtype=float)
+    centred_controls = controls - controls.mean(axis=-2, keepdims=True)
+    centred_samples = samples - samples.mean(axis=-1, keepdims=True)
+
+    # beta = Cov(X, X)^-1 Cov(X, Y), one fit per estimate. The pseudo-inverse
+    # copes with degenerate controls such as an always-zero payoff.
+    cov_xx = np.einsum("...ni,...nj->...ij", centred_controls, centred_controls)
+    cov_xy = np.einsum("...ni,...n->...i", centred_controls, centred_samples)
+    beta = np.einsum("...ij,...j->...i", np.linalg.pinv(cov_xx), cov_xy)
+
+    adjusted = samples - np.einsum(
+        "...ni,...i->...n", controls - control_means[..., None, :], beta
+    )
+
+    return adjusted, beta.shape[-1]
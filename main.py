@@ -1,75 +1,53 @@
-import pandas as pd
-from model.Heston import HestonModel
-import numpy as np
-from helpers.black_scholes_prices import getBlackScholesOptions
-from pathlib import Path
-from model.test.TestHeston import TestHestonModel
-import pickle
-from datetime import datetime, timedelta
-from helpers.date_sampler import sampleAtKeyDates
-from strategies.StaticForward import StaticForwardHedging
-from strategies.PartialHedge import PartialForwardHedging
-from strategies.DynamicDelta import DynamicDeltaHedging
-from strategies.NoHedging import NoHedging
-from metrics.IRR import calculate_irr
-from metrics.MultipleCapital import calculate_multiple_on_capital
-from metrics.VAR import calculate_cvar, calculate_var
-from metrics.ExtremeScenarios import calculate_extreme_scenarios
-from plotter.StrategyCompare import plotComparisons, plotExtremes
-from metrics.CostBenefitAnalysis import calculate_cost_benefit_analysis
-
-DEBUG = False
-PLOT = False
-
-cash_flows_eur = {
-    "2025-10-01": -10000000,  # Initial investment (outflow)
-    "2026-10-01": 1000000,  # Year 1
-    "2027-10-01": 1000000,  # Year 2
-    "2029-10-01": 1000000,  # Year 3
-    "2030-10-01": 11000000,  # Year 4
-}
-
-
-def getDataset():
-    return pd.read_csv("data/processed_data.csv")
-
-
-def getInitialParameters(dataset):
-    latest_data = dataset.iloc[-1]
-
-    """ Calculate Current Data """
-    mu = dataset["EURUSD_Spot_LOG_RETURNS"].mean() * 252
-    v0 = (latest_data["EURUSD_1Y_ATM_VOL_MID"]) ** 2
-    theta = (latest_data["EURUSD_5Y_ATM_VOL_MID"]) ** 2
-
-    dataset["EURUSD_REALISED_VOL_21D"] = (
-        dataset["EURUSD_Spot_LOG_RETURNS"].rolling(21).std() * np.sqrt(252)
-    ) / 100
-    realised_vol = dataset["EURUSD_REALISED_VOL_21D"].dropna()
-    kappa = 1.5
-    if len(realised_vol) > 1:
-        autocorr = realised_vol.autocorr(lag=1)
-        kappa = -np.log(autocorr) * 252 if autocorr > 0 else 1.5
-
-    implied_vol = (
-        dataset["EURUSD_1Y_ATM_VOL_MID"].pct_change().std() * np.sqrt(252)
-    ) / 100
-    sigma = implied_vol if not np.isnan(implied_vol) else 0.3
-    rho = -0.4
-
-    initial_params = {
-        "S0": latest_data["EURUSD_Spot_MID"],
-        "v0": v0,
-        "theta": theta,
-        "kappa": kappa,
-        "sigma": sigma,
-        "rho": rho,
-        "mu": mu,
-        "usd_ir": 0.035,
-        "eur_ir": 0.0215,
-    }
+"""
+FX hedging study: calibrate a Heston model to the EURUSD market data,
+simulate spot to the cash-flow dates and compare hedging strategies.
+
+    python main.py
+    python main.py --paths 50000 --sampler sobol --plot
+    python main.py --debug --instrument --profile calibrate simulate
+
+Plotting, the model tests, calibration and the Excel conversion are imported
+only on the paths that use them, so a headless run starts with numpy alone.
+"""
 
-    return initial_params
+import argparse
+import importlib
+from datetime import datetime
+import numpy as np
+from helpers import instrumentation
+from helpers.instrumentation import stage
+from portfolio.case_study import (
+    buildStrategies,
+    cash_flows_eur,
+    getDataset,
+    getForwardRates,
+    getInitialParameters,
+    getKeyDates,
+    getMarketData,
+    getStrategies,
+    simulateTrainingPaths,
+)
+
+# Imported lazily where they are used; with --instrument they are loaded up
+# front so instrumentation.enable() can wrap their functions
+COMPUTE_MODULES = (
+    "model.Heston",
+    "model.CalibrationCache",
+    "model.PathStore",
+    "helpers.black_scholes_prices",
+    "strategies.NoHedging",
+    "strategies.StaticForward",
+    "strategies.BatchedHedge",
+    "strategies.DynamicDelta",
+    "strategies.OptimisedHedge",
+    "strategies.RebalancedDelta",
+    "metrics.Results",
+    "metrics.ExtremeScenarios",
+    "metrics.CostBenefitAnalysis",
+    "metrics.Bootstrap",
+    "metrics.Sensitivity",
+    "metrics.Streaming",
+)
 
 
 def getHistoricalStats(dataset):
@@ -85,134 +63,270 @@ def getHistoricalStats(dataset):
     return historical_stats
 
 
-def getKeyDates():
-    last_date = datetime(2025, 8, 1)  # last date in the dataset
-    cash_flow_dates = [
-        datetime.strptime(date, "%Y-%m-%d") for date in cash_flows_eur.keys()
-    ]
-    times_to_cf = [(date - last_date).days / 365.25 for date in cash_flow_dates]
+def buildAndCalibrateModel(
+    dataset,
+    initial_params,
+    n_paths=10000,
+    n_workers=1,
+    n_chunks=None,
+    antithetic=False,
+    sampler="pseudo",
+    path_store=False,
+    debug=False,
+):
+    from model.Heston import HestonModel
+    from model.CalibrationCache import CalibrationCache
+    from model.PathStore import PathStore
+
+    model = HestonModel(
+        S0=initial_params["S0"],
+        params=initial_params,
+        n_paths=n_paths,
+        n_workers=n_workers,
+        n_chunks=n_chunks,
+        antithetic=antithetic,
+        sampler=sampler,
+        path_store=PathStore() if path_store else None,
+    )
 
-    return cash_flow_dates, times_to_cf
+    market_data = getMarketData(dataset, initial_params)
 
+    CalibrationCache().calibrate(model, market_data, dict(initial_params))
 
-def getForwardRates(initial_params):
-    forward_rates = {}
-    cash_flow_dates, times_to_cf = getKeyDates()
-    for date, T in zip(cash_flow_dates, times_to_cf):
-        forward_rate = initial_params["S0"] * np.exp(
-            (initial_params["usd_ir"] - initial_params["eur_ir"]) * T
-        )
-        forward_rates[date] = forward_rate
-    return forward_rates
+    if debug:
+        from model.test.TestHeston import TestHestonModel
 
+        model_tester = TestHestonModel(model, market_data, initial_params)
+        model_tester.visualiseSpotPaths()
+        model_tester.visualiseVolPaths()
+        model_tester.visualiseTerminalDistribution()
+        model_tester.visualiseVolatilitySmile()
+
+    return model
 
-def buildAndCalibrateModel(dataset, initial_params):
 
-    model = HestonModel(S0=initial_params["S0"], params=initial_params)
+def buildRebalancedHedge(model, dataset, forward_rates, times_to_cf, args):
+    """(name, USD cash flows) of the delta hedge rebalanced along the daily paths"""
+    from strategies.RebalancedDelta import RebalancedDeltaHedging, half_spread_from_dataset
 
-    F_1y, K_call_1y, K_put_1y, price_atm_1y_mkt, price_call_1y_mkt, price_put_1y_mkt = (
-        getBlackScholesOptions(dataset, initial_params, 1)
+    rebalancedHedging = RebalancedDeltaHedging(
+        cash_flows_eur,
+        rebalance_every=args.rebalance_every,
+        band=args.band,
+        half_spread=half_spread_from_dataset(dataset),
     )
-    F_5y, K_call_5y, K_put_5y, price_atm_5y_mkt, price_call_5y_mkt, price_put_5y_mkt = (
-        getBlackScholesOptions(dataset, initial_params, 5)
+    usd_cf = rebalancedHedging.simulate_usd_cf(model, forward_rates, times_to_cf)
+
+    accruals = rebalancedHedging.accruals
+    print(
+        f"Rebalanced hedge: {accruals['trades'].mean():.1f} trades, "
+        f"spread cost {accruals['spread_cost'].mean():,.0f} USD, "
+        f"forward points {accruals['forward_points'].mean():,.0f} USD per path"
     )
+    return rebalancedHedging.name, usd_cf
 
-    market_data = {
-        "F_1y": F_1y,
-        "K_call_1y": K_call_1y,
-        "K_put_1y": K_put_1y,
-        "F_5y": F_5y,
-        "K_call_5y": K_call_5y,
-        "K_put_5y": K_put_5y,
-        "price_atm_1y_mkt": price_atm_1y_mkt,
-        "price_call_1y_mkt": price_call_1y_mkt,
-        "price_put_1y_mkt": price_put_1y_mkt,
-        "price_atm_5y_mkt": price_atm_5y_mkt,
-        "price_call_5y_mkt": price_call_5y_mkt,
-        "price_put_5y_mkt": price_put_5y_mkt,
-    }
 
-    params_file = "model/calibrated_heston_params.pkl"
-    if Path(params_file).is_file():
-        with open(params_file, "rb") as file:
-            params = pickle.load(file)
-            model.set_parameters(params)
-    else:
-        model.calibrate(market_data)
+def streamMetrics(model, initial_params, times_to_cf):
+    """Print every strategy's risk metrics without holding all paths in memory"""
+    from metrics.Streaming import stream_strategy_metrics, streaming_summary
 
-    if DEBUG:
-        model_tester = TestHestonModel(model, market_data, initial_params)
-        model_tester.visualiseSpotPaths()
-        model_tester.visualiseVolPaths()
-        model_tester.visualiseTerminalDistribution()
-        model_tester.visualiseVolatilitySmile()
+    forward_rates = getForwardRates(initial_params)
+    with stage("stream"):
+        strategies = getStrategies(
+            cash_flows_eur, forward_rates, times_to_cf, simulateTrainingPaths(model, times_to_cf)
+        )
+        metrics = stream_strategy_metrics(model, strategies, times_to_cf, forward_rates)
+    print(streaming_summary(metrics))
 
-    return model
+
+def addModelArguments(parser):
+    """Options shared by every entry point that builds a model"""
+    parser.add_argument("--paths", type=int, default=10000, help="simulated paths")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes for path chunks (results do not depend on it)"
+    )
+    parser.add_argument(
+        "--chunks",
+        type=int,
+        default=None,
+        help="path chunks, each with its own random stream (default: one per 25000 paths)",
+    )
+    parser.add_argument("--antithetic", action="store_true", help="simulate antithetic path pairs")
+    parser.add_argument(
+        "--sampler",
+        choices=["pseudo", "sobol"],
+        default="pseudo",
+        help="pseudo-random or scrambled Sobol points with a Brownian bridge",
+    )
+    parser.add_argument(
+        "--path-store", action="store_true", help="reuse simulated paths from model/path_store/"
+    )
+    parser.add_argument(
+        "--excel", metavar="WORKBOOK", help="regenerate data/market_data.csv from the workbook first"
+    )
+    parser.add_argument("--debug", action="store_true", help="plot the Heston model tests")
+    parser.add_argument(
+        "--instrument", action="store_true", help="time every stage and write a report to reports/"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="add tracemalloc peaks to the report"
+    )
+    parser.add_argument(
+        "--profile", nargs="+", default=(), metavar="STAGE", help="stages to capture with cProfile"
+    )
+    return parser
 
 
-if __name__ == "__main__":
+def parseArguments(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    addModelArguments(parser)
+    parser.add_argument("--plot", action="store_true", help="plot the strategy comparisons")
+    parser.add_argument(
+        "--rebalance",
+        action="store_true",
+        help="add a delta hedge rebalanced along the daily paths, with bid/ask costs",
+    )
+    parser.add_argument(
+        "--rebalance-every", type=int, default=1, help="steps between rebalances (1 = daily)"
+    )
+    parser.add_argument(
+        "--band", type=float, default=0.0, help="no-trade band as a fraction of each cash flow"
+    )
+    parser.add_argument(
+        "--sensitivities",
+        action="store_true",
+        help="print the sensitivities of each strategy's risk metrics to the Heston parameters",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="compute the risk metrics chunk by chunk in bounded memory and print them only",
+    )
+    return parser.parse_args(argv)
+
+
+def buildFromArguments(args):
+    """Dataset, initial parameters and calibrated model for the parsed options"""
+    with stage("load_data"):
+        dataset = getDataset(args.excel)
+    with stage("initial_parameters"):
+        initial_params = getInitialParameters(dataset)
+
+    with stage("calibrate"):
+        model = buildAndCalibrateModel(
+            dataset,
+            initial_params,
+            n_paths=args.paths,
+            n_workers=args.workers,
+            n_chunks=args.chunks,
+            antithetic=args.antithetic,
+            sampler=args.sampler,
+            path_store=args.path_store,
+            debug=args.debug,
+        )
+    return dataset, initial_params, model
+
+
+def enableInstrumentation(args):
+    """Start instrumentation with the compute modules loaded, so they are wrapped"""
+    for module in COMPUTE_MODULES + (("model.test.TestHeston",) if args.debug else ()):
+        importlib.import_module(module)
+    instrumentation.enable(trace_memory=args.trace_memory, profile=args.profile)
+
+
+def main(argv=None):
+    args = parseArguments(argv)
 
-    dataset = getDataset()
-    initial_params = getInitialParameters(dataset)
+    if args.plot:
+        from plotter.StrategyCompare import plotComparisons, plotExtremes
 
-    model = buildAndCalibrateModel(dataset, initial_params)
+    if args.instrument:
+        enableInstrumentation(args)
+
+    dataset, initial_params, model = buildFromArguments(args)
 
     cash_flow_dates, times_to_cf = getKeyDates()
     T_horizon = max(times_to_cf)
 
-    t, S, v = model.simulate(T_horizon)
+    if args.stream:
+        streamMetrics(model, initial_params, times_to_cf)
+        return
+
+    from metrics.Results import StrategyResults
+    from metrics.ExtremeScenarios import calculate_tail_scenarios
+    from metrics.CostBenefitAnalysis import calculate_cost_benefit_analysis
+    from metrics.Bootstrap import bootstrap_cost_benefit
 
-    spot_at_cf_dates, vol_at_cf_dates = sampleAtKeyDates(t, S, v, times_to_cf)
+    with stage("simulate"):
+        _, spot_at_cf_dates, vol_at_cf_dates = model.simulate(
+            T_horizon, observation_times=times_to_cf
+        )
+        training_spot = simulateTrainingPaths(model, times_to_cf)
     forward_rates = getForwardRates(initial_params)
 
-    NoStrategy = NoHedging(cash_flows_eur)
-    staticHedging = StaticForwardHedging(cash_flows_eur)
-    partialHedging = PartialForwardHedging(cash_flows_eur)
-    partialHedging.name = "Partial Hedge 0.5"
-    partialHedging_8 = PartialForwardHedging(cash_flows_eur)
-    partialHedging_8.hedge_ratio = 0.8
-    partialHedging_8.name = "Partial Hedge 0.8"
-    dynamicHedging = DynamicDeltaHedging(cash_flows_eur)
-
-    strategies = [
-        NoStrategy,
-        staticHedging,
-        partialHedging,
-        partialHedging_8,
-        dynamicHedging,
-    ]
-    results = []
-
-    for strategy in strategies:
-        usd_cf = strategy.calculate_usd_cf(spot_at_cf_dates, forward_rates)
-
-        irr = calculate_irr(usd_cf, times_to_cf)
-        multiples = calculate_multiple_on_capital(usd_cf)
-        var = calculate_var(irr)
-        cvar = calculate_cvar(irr)
-
-        result = {
-            "Strategy Name": strategy.name,
-            "IRR": irr,
-            "Multiples": multiples,
-            "VaR": var,
-            "CVaR": cvar,
-            "USD_CF": usd_cf,
-        }
-
-        results.append(result)
-
-    results = pd.DataFrame(results)
-
-    extreme_scenario = []
-    for index, result in results.iterrows():
-        extreme_scenario.append(calculate_extreme_scenarios(result))
-    extreme_scenario = pd.DataFrame(extreme_scenario)
-
-    if PLOT:
-        plotComparisons(results)
-        plotExtremes(extreme_scenario)
-
-    cost_benefit_analysis = calculate_cost_benefit_analysis(results)
+    # Sobol scrambles are the independent batches for the standard errors
+    batch_sizes = model.chunk_sizes() if args.sampler == "sobol" else None
+
+    with stage("strategies"):
+        strategy_cfs = buildStrategies(
+            cash_flows_eur, spot_at_cf_dates, forward_rates, times_to_cf, training_spot
+        )
+    if args.rebalance:
+        with stage("rebalanced_hedge"):
+            strategy_cfs.append(
+                buildRebalancedHedge(model, dataset, forward_rates, times_to_cf, args)
+            )
+    with stage("metrics"):
+        results = StrategyResults.from_cash_flows(
+            strategy_cfs, times_to_cf, batch_sizes=batch_sizes
+        )
+
+    with stage("tail_scenarios"):
+        extreme_scenario = calculate_tail_scenarios(
+            results, spot_paths=spot_at_cf_dates
+        )
 
+    if args.plot:
+        with stage("plot"):
+            plotComparisons(results)
+            plotExtremes(extreme_scenario)
+
+    with stage("cost_benefit"):
+        cost_benefit_analysis = calculate_cost_benefit_analysis(results)
+        metric_intervals, pairwise_intervals = bootstrap_cost_benefit(
+            results,
+            method="batch_means" if args.sampler == "sobol" else "bootstrap",
+            batch_sizes=batch_sizes,
+            pair_size=2 if args.antithetic else 1,
+            n_workers=args.workers,
+        )
+
+    print(
+        results.summary[["Strategy Name", "VaR", "VaR SE", "CVaR", "CVaR SE", "IRR SE"]]
+    )
     print(cost_benefit_analysis)
+    print(metric_intervals[metric_intervals["Metric"] == "Weighted Analysis"])
+    print(pairwise_intervals[pairwise_intervals["Metric"] == "Weighted Analysis"])
+
+    if args.sensitivities:
+        from metrics.Sensitivity import parameter_sensitivities
+
+        with stage("sensitivities"):
+            sensitivities = parameter_sensitivities(
+                model,
+                lambda spot: buildStrategies(
+                    cash_flows_eur, spot, forward_rates, times_to_cf, training_spot
+                ),
+                times_to_cf,
+            )
+        print(sensitivities)
+
+    if args.instrument:
+        instrumentation.report(
+            f"reports/instrumentation-{datetime.now():%Y%m%d-%H%M%S}.json"
+        )
+        instrumentation.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import numpy as np
+import pandas as pd
+from itertools import combinations
+from metrics.CostBenefitAnalysis import cost_benefit_metrics
+
+
+def risk_metrics(mean_irr, irr_std, var, cvar):
+    """Risk metrics plus the cost-benefit metrics derived from them"""
+    return {
+        "Mean IRR": mean_irr,
+        "IRR Std": irr_std,
+        "VaR": var,
+        "CVaR": cvar,
+        **cost_benefit_metrics(mean_irr, irr_std, var),
+    }
+
+
+def strategy_statistics(irrs, confidence=0.95):
+    """
+    Metrics over the last axis of irrs, which has the strategies on axis 0
+    (and e.g. batches in between).
+    """
+    var = -np.percentile(irrs, (1 - confidence) * 100, axis=-1)
+    tail = irrs <= -var[..., None]
+    cvar = -np.sum(irrs * tail, axis=-1) / np.sum(tail, axis=-1)
+
+    return risk_metrics(irrs.mean(axis=-1), irrs.std(axis=-1), var, cvar)
+
+
+def _bootstrap_chunk(irrs, order, seed, n_resamples, pair_size, confidence):
+    """
+    Metrics on n_resamples bootstrap resamples, shared by all strategies.
+
+    A resample is held as the number of times each path was drawn. Means and
+    variances are then one matrix product, and VaR/CVaR come from cumulative
+    counts over the lowest sorted IRRs of each strategy (order holds each
+    strategy's argsort). This gives the same numbers as indexing out every
+    resample, without the (strategies, resamples, paths) copy.
+    """
+    rng = np.random.default_rng(seed)
+    n_strategies, n_paths = irrs.shape
+    n_units = n_paths // pair_size
+
+    # Draw whole antithetic pairs so the pairing survives
+    draws = rng.integers(0, n_units, (n_resamples, n_units))
+    draws += n_units * np.arange(n_resamples)[:, None]
+    counts = np.bincount(draws.ravel(), minlength=n_resamples * n_units)
+    counts = np.repeat(counts.reshape(n_resamples, n_units), pair_size, axis=1)
+
+    # Centre on the sample mean before squaring to avoid cancellation
+    centre = irrs.mean(axis=1)
+    weights = counts.astype(float)
+    mean_irr = (weights @ irrs.T).T / n_paths
+    irr_std = np.sqrt(
+        np.maximum(
+            (weights @ ((irrs - centre[:, None]) ** 2).T).T / n_paths
+            - (mean_irr - centre[:, None]) ** 2,
+            0,
+        )
+    )
+
+    position = (n_paths - 1) * (1 - confidence)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, n_paths - 1)
+    fraction = position - lower
+
+    # The resample quantile sits well inside the lowest few percent of the
+    # sorted paths, so only that prefix needs cumulative counts
+    prefix = min(n_paths, int(position + 10 * np.sqrt(n_paths) + 2 * pair_size + 1))
+
+    var, cvar = np.zeros((2, n_strategies, n_resamples))
+    rows = np.arange(n_resamples)
+    for s in range(n_strategies):
+        length = prefix
+        while True:
+            x = irrs[s, order[s, :length]]
+            cumulative = np.cumsum(counts[:, order[s, :length]], axis=1)
+            if length == n_paths or cumulative[:, -1].min() > upper:
+                break
+            length = min(n_paths, 2 * length)
+        cumulative_sum = np.cumsum(counts[:, order[s, :length]] * x, axis=1)
+
+        # k-th order statistic of each resample (0-based)
+        x_lower = x[np.sum(cumulative <= lower, axis=1)]
+        x_upper = x[np.sum(cumulative <= upper, axis=1)]
+        percentile = x_lower + fraction * (x_upper - x_lower)
+        var[s] = -percentile
+
+        last_in_tail = np.searchsorted(x, percentile, side="right") - 1
+        cvar[s] = -cumulative_sum[rows, last_in_tail] / cumulative[rows, last_in_tail]
+
+    return np.stack(list(risk_metrics(mean_irr, irr_std, var, cvar).values()))
+
+
+def _batch_statistics(irrs, valid, boundaries, confidence):
+    """
+    Metrics on contiguous batches of paths (e.g. Sobol scrambles), cut on the
+    full path index and keeping the valid paths of each batch
+    """
+    statistics = [
+        np.stack(
+            list(strategy_statistics(irrs[:, start:end][:, valid[start:end]], confidence).values())
+        )
+        for start, end in zip(boundaries[:-1], boundaries[1:])
+    ]
+    return np.stack(statistics, axis=-1)
+
+
+def bootstrap_cost_benefit(
+    results,
+    n_resamples=1000,
+    level=0.95,
+    method="bootstrap",
+    n_batches=25,
+    batch_sizes=None,
+    pair_size=1,
+    n_workers=1,
+    resamples_per_job=25,
+    random_seed=42,
+    confidence=0.95,
+):
+    """
+    Confidence intervals for every strategy metric and for the difference of
+    every pair of strategies.
+
+    All strategies are evaluated on the same resampled path indices, so the
+    pairwise intervals reflect the common random numbers and are much tighter
+    than comparing the per-strategy intervals. Only paths where every
+    strategy's IRR converged are used. method="bootstrap" gives percentile
+    intervals from n_resamples resamples, run in jobs of resamples_per_job on
+    the shared pool of n_workers processes (model.Heston.worker_pool); every
+    job has its own seed, so the intervals do not depend on n_workers. method="batch_means" gives Student t intervals from
+    n_batches contiguous batches, or batches of batch_sizes paths, which is
+    the right choice when the batches are independent Sobol scrambles (pass
+    HestonModel.chunk_sizes()). pair_size=2 keeps antithetic pairs together.
+
+    Returns two DataFrames: per-strategy intervals and pairwise differences.
+    """
+    all_irrs = results.irr
+
+    valid = np.isfinite(all_irrs).all(axis=0).reshape(-1, pair_size).all(axis=1)
+    valid = np.repeat(valid, pair_size)
+    irrs = all_irrs[:, valid]
+
+    estimates = strategy_statistics(irrs, confidence)
+    metric_names = list(estimates)
+    estimates = np.stack(list(estimates.values()))
+
+    alpha = 1 - level
+    if method == "bootstrap":
+        jobs = -(-n_resamples // resamples_per_job)
+        sizes = [len(job) for job in np.array_split(np.arange(n_resamples), jobs)]
+        seeds = np.random.SeedSequence(random_seed).spawn(jobs)
+        order = np.argsort(irrs, axis=1)
+        args = (
+            [irrs] * jobs,
+            [order] * jobs,
+            seeds,
+            sizes,
+            [pair_size] * jobs,
+            [confidence] * jobs,
+        )
+
+        if n_workers > 1 and jobs > 1:
+            from model.Heston import worker_pool
+
+            pool = worker_pool(n_workers)
+            samples = np.concatenate(list(pool.map(_bootstrap_chunk, *args)), axis=-1)
+        else:
+            samples = np.concatenate(list(map(_bootstrap_chunk, *args)), axis=-1)
+
+        def interval(values, estimate):
+            return np.percentile(values, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=-1)
+
+    elif method == "batch_means":
+        from scipy.stats import t as student_t
+
+        if batch_sizes is not None:
+            boundaries = np.concatenate([[0], np.cumsum(batch_sizes)])
+        else:
+            boundaries = pair_size * np.linspace(
+                0, all_irrs.shape[1] // pair_size, n_batches + 1
+            ).astype(int)
+        n_batches = len(boundaries) - 1
+        samples = _batch_statistics(all_irrs, valid, boundaries, confidence)
+        t_value = student_t.ppf(1 - alpha / 2, n_batches - 1)
+
+        def interval(values, estimate):
+            half_width = t_value * values.std(axis=-1, ddof=1) / np.sqrt(n_batches)
+            return np.stack([estimate - half_width, estimate + half_width])
+
+    else:
+        raise ValueError(f"Unknown interval method: {method}")
+
+    names = results.names
+
+    lower, upper = interval(samples, estimates)
+    metric_intervals = pd.DataFrame(
+        [
+            {
+                "Strategy Name": name,
+                "Metric": metric,
+                "Estimate": estimates[m, s],
+                "Lower": lower[m, s],
+                "Upper": upper[m, s],
+            }
+            for m, metric in enumerate(metric_names)
+            for s, name in enumerate(names)
+        ]
+    )
+
+    pairs = list(combinations(range(len(names)), 2))
+    first, second = np.array(pairs).T
+    differences = samples[:, first] - samples[:, second]
+    difference_estimates = estimates[:, first] - estimates[:, second]
+    lower, upper = interval(differences, difference_estimates)
+
+    pairwise_intervals = pd.DataFrame(
+        [
+            {
+                "Strategy A": names[a],
+                "Strategy B": names[b],
+                "Metric": metric,
+                "Difference": difference_estimates[m, p],
+                "Lower": lower[m, p],
+                "Upper": upper[m, p],
+                "Significant": lower[m, p] > 0 or upper[m, p] < 0,
+            }
+            for m, metric in enumerate(metric_names)
+            for p, (a, b) in enumerate(pairs)
+        ]
+    )
+
+    return metric_intervals, pairwise_intervals
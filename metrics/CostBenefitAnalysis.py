@@ -1,29 +1,31 @@
 import pandas as pd
 
 
-def calculate_cost_benefit_analysis(results):
+def cost_benefit_metrics(mean_irr, irr_std, var):
+    """
+    Cost-benefit metrics of every strategy against the first (no hedge).
+    Inputs have the strategies on axis 0 and may carry extra axes, e.g.
+    bootstrap resamples.
+    """
+    irr_preserve = mean_irr[0] - mean_irr
+    risk_reduction = (irr_std[0] - irr_std) / irr_std[0]
+    var_reduction = (var[0] - var) / var[0]
+
+    return {
+        "IRR Preservation": irr_preserve,
+        "Risk Reduction": risk_reduction,
+        "VaR Reduction": var_reduction,
+        "Weighted Analysis": 0.33 * irr_preserve
+        + 0.33 * risk_reduction
+        + 0.33 * var_reduction,
+    }
 
-    no_hedge = results.iloc[0]
-    hedging_strategies = results.iloc[0:]
 
-    cba = []
-    for index, strategy in hedging_strategies.iterrows():
-        irr_preserve = no_hedge["IRR"].mean() - strategy["IRR"].mean()
-        risk_reduction = (no_hedge["IRR"].std() - strategy["IRR"].std()) / no_hedge[
-            "IRR"
-        ].std()
-        var_reduction = (no_hedge["VaR"] - strategy["VaR"]) / no_hedge["VaR"]
+def calculate_cost_benefit_analysis(results):
+    """Cost-benefit table of a metrics.Results.StrategyResults"""
 
-        cba.append(
-            {
-                "Strategy Name": strategy["Strategy Name"],
-                "IRR Preservation": irr_preserve,
-                "Risk Reduction": risk_reduction,
-                "VaR Reduction": var_reduction,
-                "Weighted Analysis": 0.33 * irr_preserve
-                + 0.33 * risk_reduction
-                + 0.33 * var_reduction,
-            }
-        )
+    metrics = cost_benefit_metrics(
+        results.mean_irr(), results.irr_std(), results.summary["VaR"].to_numpy()
+    )
 
-    return pd.DataFrame(cba)
+    return pd.DataFrame({"Strategy Name": results.names, **metrics})
@@ -1,23 +1,65 @@
 import numpy as np
-from metrics.MultipleCapital import calculate_multiple_on_capital
-
-def calculate_extreme_scenarios(result, n_extreme=100):
-    
-    irrs = result['IRR']
-    usd_cfs = result['USD_CF']
-
-    worst_idx = np.argsort(irrs)[:n_extreme]
-    worst_irrs = irrs[worst_idx]
-    worst_cfs = usd_cfs[worst_idx, :]
-    
-    best_idx = np.argsort(irrs)[-n_extreme:]
-    best_irrs = irrs[best_idx]
-    best_cfs = usd_cfs[best_idx, :]
-    
-    return {
-        'Strategy Name': result['Strategy Name'],
-        'worst_IRR': worst_irrs,
-        'best_IRR': best_irrs,
-        'worst_Multiple': calculate_multiple_on_capital(worst_cfs),
-        'best_Multiple': calculate_multiple_on_capital(best_cfs)
-    }
\ No newline at end of file
+
+
+def select_tail_paths(irrs, n_extreme=100):
+    """
+    Path ids of the n_extreme worst and best IRRs of every strategy.
+
+    irrs is (n_strategies, n_paths) with NaN for paths without an IRR. Uses
+    argpartition (O(n_paths)) and only sorts the selected paths, worst and
+    best both in ascending IRR order. Rows with fewer than n_extreme valid
+    paths are padded with -1.
+    """
+    irrs = np.atleast_2d(np.asarray(irrs, dtype=float))
+    k = min(n_extreme, irrs.shape[1])
+
+    # NaN sorts last under both partitions, so it never enters a tail
+    worst = np.argpartition(irrs, k - 1, axis=1)[:, :k]
+    best = np.argpartition(-irrs, k - 1, axis=1)[:, :k]
+
+    worst = np.take_along_axis(
+        worst, np.argsort(np.take_along_axis(irrs, worst, axis=1), axis=1), axis=1
+    )
+    best = np.take_along_axis(
+        best, np.argsort(np.take_along_axis(irrs, best, axis=1), axis=1), axis=1
+    )
+
+    worst = np.where(np.isnan(np.take_along_axis(irrs, worst, axis=1)), -1, worst)
+    best = np.where(np.isnan(np.take_along_axis(irrs, best, axis=1)), -1, best)
+
+    return worst, best
+
+
+def calculate_tail_scenarios(results, n_extreme=100, spot_paths=None, vol_paths=None):
+    """
+    Worst and best scenarios of every strategy in a StrategyResults, from one
+    batched selection. spot_paths and vol_paths, shaped (n_times, n_paths) as
+    returned by HestonModel.simulate, add the matching simulated paths to
+    each scenario.
+    """
+    worst, best = select_tail_paths(results.irr, n_extreme)
+
+    scenarios = []
+    for row, name in enumerate(results.names):
+        worst_paths = worst[row][worst[row] >= 0]
+        best_paths = best[row][best[row] >= 0]
+
+        scenario = {
+            "Strategy Name": name,
+            "worst_IRR": results.irr[row, worst_paths],
+            "best_IRR": results.irr[row, best_paths],
+            "worst_Multiple": results.multiples[row, worst_paths],
+            "best_Multiple": results.multiples[row, best_paths],
+            "worst_paths": worst_paths,
+            "best_paths": best_paths,
+        }
+        if spot_paths is not None:
+            scenario["worst_spot"] = spot_paths[:, worst_paths].T
+            scenario["best_spot"] = spot_paths[:, best_paths].T
+        if vol_paths is not None:
+            scenario["worst_vol"] = vol_paths[:, worst_paths].T
+            scenario["best_vol"] = vol_paths[:, best_paths].T
+
+        scenarios.append(scenario)
+
+    return scenarios
@@ -1,7 +1,11 @@
 import numpy as np
 
 def calculate_multiple_on_capital(cash_flows):
-    inflows = np.sum(cash_flows[:, 1:], axis=1)
-    outflows = np.abs(cash_flows[:, 0]) 
+    """
+    Total distributions over total capital called, per path. Flows are split
+    by sign, so schedules with several capital calls count all of them.
+    """
+    inflows = np.sum(np.where(cash_flows > 0, cash_flows, 0.0), axis=1)
+    outflows = -np.sum(np.where(cash_flows < 0, cash_flows, 0.0), axis=1)
     multiples = inflows / outflows
     return multiples
@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+from functools import partial
+from pathlib import Path
+from metrics.IRR import solve_irr
+from metrics.MultipleCapital import calculate_multiple_on_capital
+from metrics.StandardError import calculate_standard_error
+from metrics.VAR import calculate_cvar, calculate_var
+
+
+class StrategyResults:
+    """
+    Columnar results of every strategy on one set of paths.
+
+    The per-path data are contiguous arrays with the strategies on axis 0:
+    irr (n_strategies, n_paths), NaN where the IRR did not converge,
+    multiples (n_strategies, n_paths) and usd_cf (n_strategies, n_paths,
+    n_dates). Row s of any of them is a view, not a copy. Scalar metrics
+    live in the summary DataFrame, one row per strategy in the same order.
+    """
+
+    def __init__(
+        self,
+        names,
+        irr,
+        usd_cf,
+        multiples=None,
+        summary=None,
+        n_batches=25,
+        confidence=0.95,
+        batch_sizes=None,
+    ):
+        self.names = list(names)
+        self.irr = np.ascontiguousarray(irr, dtype=float)
+        self.usd_cf = np.ascontiguousarray(usd_cf, dtype=float)
+        self.multiples = (
+            np.ascontiguousarray(multiples, dtype=float)
+            if multiples is not None
+            else calculate_multiple_on_capital(
+                self.usd_cf.reshape(-1, self.usd_cf.shape[-1])
+            ).reshape(self.irr.shape)
+        )
+        self.summary = (
+            summary
+            if summary is not None
+            else self.summarise(n_batches, confidence, batch_sizes)
+        )
+
+    @classmethod
+    def from_cash_flows(
+        cls, strategy_cfs, times_to_cf, n_batches=25, confidence=0.95, batch_sizes=None
+    ):
+        """
+        Solve the IRRs of every (name, usd_cf) pair in one vectorised call and
+        build the summary table. batch_sizes (e.g. the Sobol scrambles) sets
+        the standard-error batches instead of n_batches even ones.
+        """
+        names = [name for name, _ in strategy_cfs]
+        usd_cf = np.stack([cash_flows for _, cash_flows in strategy_cfs])
+        n_strategies, n_paths, n_dates = usd_cf.shape
+
+        irr, converged = solve_irr(usd_cf.reshape(-1, n_dates), times_to_cf)
+        irr = irr.reshape(n_strategies, n_paths)
+
+        for ok in converged.reshape(n_strategies, n_paths):
+            n_failed = np.count_nonzero(~ok)
+            if n_failed:
+                print(f"IRR did not converge on {n_failed} of {n_paths} paths")
+
+        return cls(
+            names,
+            irr,
+            usd_cf,
+            n_batches=n_batches,
+            confidence=confidence,
+            batch_sizes=batch_sizes,
+        )
+
+    @property
+    def converged(self):
+        return ~np.isnan(self.irr)
+
+    @property
+    def path_ids(self):
+        """Ids of the converged paths of each strategy"""
+        return [np.flatnonzero(ok) for ok in self.converged]
+
+    def index(self, name):
+        return self.names.index(name)
+
+    def valid_irr(self, strategy):
+        """Converged IRRs of one strategy, by name or position"""
+        row = self.index(strategy) if isinstance(strategy, str) else strategy
+        irr = self.irr[row]
+        return irr[~np.isnan(irr)]
+
+    def strategy(self, strategy):
+        """Views of one strategy's per-path arrays"""
+        row = self.index(strategy) if isinstance(strategy, str) else strategy
+        return {
+            "Strategy Name": self.names[row],
+            "IRR": self.irr[row],
+            "Multiples": self.multiples[row],
+            "USD_CF": self.usd_cf[row],
+        }
+
+    def mean_irr(self):
+        return np.nanmean(self.irr, axis=1)
+
+    def irr_std(self):
+        return np.nanstd(self.irr, axis=1)
+
+    def summarise(self, n_batches=25, confidence=0.95, batch_sizes=None):
+        """Scalar metrics of every strategy"""
+        var = partial(calculate_var, confidence=confidence)
+        cvar = partial(calculate_cvar, confidence=confidence)
+
+        rows = []
+        for row, name in enumerate(self.names):
+            irr = self.valid_irr(row)
+            rows.append(
+                {
+                    "Strategy Name": name,
+                    "Mean IRR": irr.mean(),
+                    "IRR Std": irr.std(),
+                    "VaR": calculate_var(irr, confidence),
+                    "CVaR": calculate_cvar(irr, confidence),
+                    "Mean Multiple": self.multiples[row].mean(),
+                    "Not Converged": int(np.isnan(self.irr[row]).sum()),
+                    # Batches are cut on the full path index, NaNs included
+                    "IRR SE": calculate_standard_error(
+                        self.irr[row], n_batches=n_batches, batch_sizes=batch_sizes
+                    ),
+                    "VaR SE": calculate_standard_error(
+                        self.irr[row], var, n_batches, batch_sizes
+                    ),
+                    "CVaR SE": calculate_standard_error(
+                        self.irr[row], cvar, n_batches, batch_sizes
+                    ),
+                }
+            )
+        return pd.DataFrame(rows)
+
+    def save(self, path):
+        """
+        Save to .npz (all arrays plus the summary) or .parquet (one row per
+        strategy and path, with the summary alongside as *.summary.parquet;
+        needs pyarrow or fastparquet)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.suffix == ".parquet":
+            n_strategies, n_paths, n_dates = self.usd_cf.shape
+            frame = pd.DataFrame(
+                {
+                    "Strategy Name": np.repeat(self.names, n_paths),
+                    "Path": np.tile(np.arange(n_paths), n_strategies),
+                    "IRR": self.irr.ravel(),
+                    "Multiple": self.multiples.ravel(),
+                    **{
+                        f"USD_CF_{date}": self.usd_cf[:, :, date].ravel()
+                        for date in range(n_dates)
+                    },
+                }
+            )
+            frame.to_parquet(path, index=False)
+            self.summary.to_parquet(path.with_suffix(".summary.parquet"), index=False)
+            return
+
+        np.savez(
+            path,
+            names=np.array(self.names),
+            irr=self.irr,
+            usd_cf=self.usd_cf,
+            multiples=self.multiples,
+            summary_columns=np.array(self.summary.columns, dtype=str),
+            **{
+                f"summary_{column}": np.asarray(self.summary[column].tolist())
+                for column in self.summary
+            },
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a .npz or .parquet written by save"""
+        path = Path(path)
+        if path.suffix == ".parquet":
+            frame = pd.read_parquet(path)
+            names = list(dict.fromkeys(frame["Strategy Name"]))
+            shape = (len(names), len(frame) // len(names))
+            dates = [column for column in frame if column.startswith("USD_CF_")]
+            return cls(
+                names,
+                frame["IRR"].to_numpy().reshape(shape),
+                frame[dates].to_numpy().reshape(shape + (len(dates),)),
+                multiples=frame["Multiple"].to_numpy().reshape(shape),
+                summary=pd.read_parquet(path.with_suffix(".summary.parquet")),
+            )
+
+        with np.load(path) as data:
+            summary = pd.DataFrame(
+                {column: data[f"summary_{column}"] for column in data["summary_columns"]}
+            )
+            return cls(
+                data["names"].tolist(),
+                data["irr"],
+                data["usd_cf"],
+                multiples=data["multiples"],
+                summary=summary,
+            )
@@ -0,0 +1,119 @@
+import copy
+import numpy as np
+import pandas as pd
+from metrics.IRR import solve_irr
+from metrics.VAR import calculate_cvar, calculate_var
+
+PARAMETERS = ("v0", "theta", "kappa", "sigma", "rho", "mu")
+
+# Smallest bump of each parameter, for values at or near zero
+MIN_BUMPS = {
+    "v0": 1e-4,
+    "theta": 1e-4,
+    "kappa": 0.01,
+    "sigma": 0.001,
+    "rho": 0.01,
+    "mu": 0.001,
+}
+
+# Bumped values are kept where the model is defined
+LIMITS = {
+    "v0": (1e-8, np.inf),
+    "theta": (1e-8, np.inf),
+    "kappa": (1e-8, np.inf),
+    "sigma": (1e-8, np.inf),
+    "rho": (-0.999, 0.999),
+    "mu": (-np.inf, np.inf),
+}
+
+
+def bumped_parameters(model, parameters=PARAMETERS, relative_bump=0.05):
+    """
+    Parameter values of the base model and of an up and a down bump of each
+    parameter, as (n_models,) arrays keyed by name. Model 0 is the base and
+    models 2i + 1, 2i + 2 bump parameters[i] up and down.
+    """
+    base = {name: float(getattr(model, name)) for name in PARAMETERS}
+    values = {name: [value] for name, value in base.items()}
+
+    for parameter in parameters:
+        bump = max(relative_bump * abs(base[parameter]), MIN_BUMPS[parameter])
+        lower, upper = LIMITS[parameter]
+        for value in (base[parameter] + bump, base[parameter] - bump):
+            for name in PARAMETERS:
+                values[name].append(
+                    np.clip(value, lower, upper) if name == parameter else base[name]
+                )
+
+    return {name: np.array(column) for name, column in values.items()}
+
+
+def simulate_bumped(model, values, T, observation_times):
+    """
+    Simulate every bumped model in one pass on the model's random numbers.
+    Returns spot of shape (n_observations, n_models, n_paths).
+    """
+    batched = copy.copy(model)
+    for name, column in values.items():
+        setattr(batched, name, column[:, None])
+    _, spot, _ = batched.simulate_paths(T, observation_times=observation_times)
+    return spot
+
+
+def strategy_metrics(irr, confidence=0.95):
+    """Mean IRR, VaR and CVaR of one row of IRRs, ignoring non-converged paths"""
+    irr = irr[~np.isnan(irr)]
+    return {
+        "Mean IRR": irr.mean(),
+        "VaR": calculate_var(irr, confidence),
+        "CVaR": calculate_cvar(irr, confidence),
+    }
+
+
+def parameter_sensitivities(
+    model,
+    build_strategies,
+    times_to_cf,
+    parameters=PARAMETERS,
+    relative_bump=0.05,
+    confidence=0.95,
+):
+    """
+    Central-difference sensitivities of each strategy's mean IRR, VaR and
+    CVaR to the Heston parameters, per unit of each parameter.
+
+    Every bump is simulated in the same pass on the same Brownian increments
+    (common random numbers), so the differences carry little Monte Carlo
+    noise. build_strategies(spot_at_cf_dates) returns the (name, usd_cf)
+    pairs of the strategies, as case_study.buildStrategies does. Returns one row
+    per strategy and metric, with the base value and one column per
+    parameter.
+    """
+    values = bumped_parameters(model, parameters, relative_bump)
+    spot = simulate_bumped(model, values, max(times_to_cf), times_to_cf)
+    n_models = spot.shape[1]
+
+    names = None
+    usd_cf = []
+    for row in range(n_models):
+        strategy_cfs = build_strategies(np.ascontiguousarray(spot[:, row]))
+        names = [name for name, _ in strategy_cfs]
+        usd_cf.append(np.stack([cash_flows for _, cash_flows in strategy_cfs]))
+
+    # IRRs of every model, strategy and path in one vectorised solve
+    usd_cf = np.stack(usd_cf)
+    irr, _ = solve_irr(usd_cf.reshape(-1, usd_cf.shape[-1]), times_to_cf)
+    irr = irr.reshape(usd_cf.shape[:3])
+
+    rows = []
+    for column, name in enumerate(names):
+        metrics = [strategy_metrics(irr[row, column], confidence) for row in range(n_models)]
+        for metric in metrics[0]:
+            entry = {"Strategy Name": name, "Metric": metric, "Base": metrics[0][metric]}
+            for index, parameter in enumerate(parameters):
+                up, down = 2 * index + 1, 2 * index + 2
+                step = values[parameter][up] - values[parameter][down]
+                entry[parameter] = (metrics[up][metric] - metrics[down][metric]) / step
+            rows.append(entry)
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,29 @@
+import numpy as np
+
+
+def calculate_standard_error(values, statistic=np.mean, n_batches=25, batch_sizes=None):
+    """
+    Batch-means standard error of any path statistic (mean IRR, VaR, CVaR).
+
+    The paths are cut into contiguous batches with even boundaries on the
+    full path index, so antithetic pairs (2i, 2i + 1) stay in the same batch.
+    batch_sizes gives the batches explicitly instead, e.g. the Sobol
+    scrambles from HestonModel.chunk_sizes(). NaN values (non-converged
+    paths) are dropped within each batch, which leaves the boundaries where
+    they are.
+    """
+    values = np.asarray(values)
+    if batch_sizes is not None:
+        boundaries = np.concatenate([[0], np.cumsum(batch_sizes)])
+    else:
+        boundaries = 2 * np.linspace(0, len(values) // 2, n_batches + 1).astype(int)
+        boundaries[-1] = len(values)
+
+    batch_stats = np.array(
+        [
+            statistic(batch[~np.isnan(batch)])
+            for batch in (values[start:end] for start, end in zip(boundaries[:-1], boundaries[1:]))
+        ]
+    )
+
+    return batch_stats.std(ddof=1) / np.sqrt(len(batch_stats))
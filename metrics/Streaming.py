@@ -0,0 +1,225 @@
+import numpy as np
+from metrics.IRR import solve_irr
+from metrics.MultipleCapital import calculate_multiple_on_capital
+
+
+class RunningMoments:
+    """Count, mean and sum of squared deviations, mergeable (Chan et al.)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        chunk = RunningMoments()
+        chunk.count = len(values)
+        if chunk.count:
+            chunk.mean = float(np.mean(values))
+            chunk.m2 = float(np.sum((values - chunk.mean) ** 2))
+        self.merge(chunk)
+
+    def merge(self, other):
+        count = self.count + other.count
+        if count == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+
+    def std(self, ddof=0):
+        """Same convention as np.std"""
+        if self.count <= ddof:
+            return np.nan
+        return np.sqrt(self.m2 / (self.count - ddof))
+
+
+class StreamingRiskMetrics:
+    """
+    Mean, std, VaR, CVaR, multiples and tail sets of the IRR, fed chunk by
+    chunk and mergeable across worker processes.
+
+    The lower tail is kept in an exact buffer sized for max_paths, so VaR and
+    CVaR equal metrics.VAR on the full array (same np.percentile
+    interpolation) as long as no more than max_paths paths are fed in. Memory
+    is O((1 - confidence) * max_paths + n_extreme), independent of the chunks.
+    """
+
+    def __init__(self, max_paths, confidence=0.95, n_extreme=100):
+        self.max_paths = max_paths
+        self.confidence = confidence
+        self.n_extreme = n_extreme
+        self.tail_capacity = int(np.floor((max_paths - 1) * (1 - confidence))) + 2
+
+        self.irr = RunningMoments()
+        self.multiples = RunningMoments()
+        self.not_converged = 0
+
+        self.tail_irr = np.empty(0)
+        self.tail_paths = np.empty(0, dtype=np.int64)
+        self.best_irr = np.empty(0)
+        self.best_paths = np.empty(0, dtype=np.int64)
+
+    def update(self, irr, multiples=None, path_ids=None):
+        """Add a chunk of path IRRs (NaN for paths without a root)"""
+        irr = np.asarray(irr, dtype=float)
+        if path_ids is None:
+            path_ids = np.arange(len(irr)) + self.irr.count + self.not_converged
+
+        converged = ~np.isnan(irr)
+        self.not_converged += int(np.count_nonzero(~converged))
+        irr, path_ids = irr[converged], np.asarray(path_ids)[converged]
+
+        self.irr.update(irr)
+        if multiples is not None:
+            self.multiples.update(np.asarray(multiples, dtype=float))
+
+        self.tail_irr, self.tail_paths = self._keep_lowest(
+            np.concatenate([self.tail_irr, irr]),
+            np.concatenate([self.tail_paths, path_ids]),
+            self.tail_capacity,
+        )
+        best_irr, best_paths = self._keep_lowest(
+            -np.concatenate([self.best_irr, irr]),
+            np.concatenate([self.best_paths, path_ids]),
+            self.n_extreme,
+        )
+        self.best_irr, self.best_paths = -best_irr, best_paths
+
+    def merge(self, other):
+        """Fold in the accumulator of another chunk or worker"""
+        self.irr.merge(other.irr)
+        self.multiples.merge(other.multiples)
+        self.not_converged += other.not_converged
+
+        self.tail_irr, self.tail_paths = self._keep_lowest(
+            np.concatenate([self.tail_irr, other.tail_irr]),
+            np.concatenate([self.tail_paths, other.tail_paths]),
+            self.tail_capacity,
+        )
+        best_irr, best_paths = self._keep_lowest(
+            -np.concatenate([self.best_irr, other.best_irr]),
+            np.concatenate([self.best_paths, other.best_paths]),
+            self.n_extreme,
+        )
+        self.best_irr, self.best_paths = -best_irr, best_paths
+
+    @staticmethod
+    def _keep_lowest(values, path_ids, k):
+        """The k smallest values (sorted) and their path ids"""
+        if len(values) > k:
+            keep = np.argpartition(values, k - 1)[:k]
+            values, path_ids = values[keep], path_ids[keep]
+        order = np.argsort(values, kind="stable")
+        return values[order], path_ids[order]
+
+    def var(self):
+        """-np.percentile(irr, 100 * (1 - confidence)) from the tail buffer"""
+        n = self.irr.count
+        if n > self.max_paths:
+            raise ValueError(f"Fed {n} paths into a buffer sized for {self.max_paths}")
+
+        position = (n - 1) * (1 - self.confidence)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, n - 1)
+        fraction = position - lower
+        percentile = self.tail_irr[lower] + fraction * (
+            self.tail_irr[upper] - self.tail_irr[lower]
+        )
+        return -percentile
+
+    def cvar(self):
+        var = self.var()
+        return -self.tail_irr[self.tail_irr <= -var].mean()
+
+    def summary(self):
+        return {
+            "Paths": self.irr.count,
+            "Not Converged": self.not_converged,
+            "Mean IRR": self.irr.mean,
+            "IRR Std": self.irr.std(),
+            "VaR": self.var(),
+            "CVaR": self.cvar(),
+            "Mean Multiple": self.multiples.mean,
+            "Multiple Std": self.multiples.std(),
+            "worst_IRR": self.tail_irr[: self.n_extreme],
+            "worst_paths": self.tail_paths[: self.n_extreme],
+            "best_IRR": self.best_irr,
+            "best_paths": self.best_paths,
+        }
+
+
+def strategy_cash_flows(strategies, spot_at_cf_dates, forward_rates):
+    """(name, usd_cf) for every strategy, unpacking batched hedge programs"""
+    for strategy in strategies:
+        usd_cf = strategy.calculate_usd_cf(spot_at_cf_dates, forward_rates)
+        if usd_cf.ndim == 3:
+            yield from zip(strategy.names, usd_cf)
+        else:
+            yield strategy.name, usd_cf
+
+
+def _chunk_risk_metrics(model, job, path_offset, strategies, forward_rates, times, max_paths, confidence):
+    """Simulate one chunk and reduce it to one accumulator per strategy"""
+    spot_at_cf_dates, _, _ = model.simulate_chunk(job)
+    path_ids = path_offset + np.arange(spot_at_cf_dates.shape[1])
+
+    metrics = {}
+    for name, usd_cf in strategy_cash_flows(strategies, spot_at_cf_dates, forward_rates):
+        irr, _ = solve_irr(usd_cf, times)
+        metrics[name] = StreamingRiskMetrics(max_paths, confidence)
+        metrics[name].update(irr, calculate_multiple_on_capital(usd_cf), path_ids)
+
+    return metrics
+
+
+def stream_strategy_metrics(model, strategies, times_to_cf, forward_rates, confidence=0.95):
+    """
+    Simulation -> strategy -> IRR -> metrics in bounded memory.
+
+    Each chunk of paths is simulated at the cash-flow dates only, turned into
+    per-strategy accumulators (on the model's worker pool when n_workers > 1)
+    and merged, so no array ever holds all paths.
+    """
+    _, jobs = model.simulation_jobs(max(times_to_cf), times_to_cf)
+    path_offsets = np.cumsum([0] + [job[3] for job in jobs])[:-1]
+    max_paths = int(sum(job[3] for job in jobs))
+
+    args = (
+        [model] * len(jobs),
+        jobs,
+        path_offsets,
+        [strategies] * len(jobs),
+        [forward_rates] * len(jobs),
+        [np.asarray(times_to_cf, dtype=float)] * len(jobs),
+        [max_paths] * len(jobs),
+        [confidence] * len(jobs),
+    )
+
+    return _merge_chunks(model.map_chunks(_chunk_risk_metrics, *args))
+
+
+def streaming_summary(metrics):
+    """One row of scalar metrics per strategy of stream_strategy_metrics"""
+    import pandas as pd
+
+    rows = []
+    for name, accumulator in metrics.items():
+        summary = accumulator.summary()
+        rows.append(
+            {"Strategy Name": name}
+            | {key: value for key, value in summary.items() if np.ndim(value) == 0}
+        )
+    return pd.DataFrame(rows)
+
+
+def _merge_chunks(chunk_metrics):
+    merged = {}
+    for metrics in chunk_metrics:
+        for name, accumulator in metrics.items():
+            if name in merged:
+                merged[name].merge(accumulator)
+            else:
+                merged[name] = accumulator
+    return merged
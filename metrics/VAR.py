@@ -5,7 +5,7 @@ def calculate_var(returns, confidence=0.95):
     return -np.percentile(returns, (1 - confidence) * 100)
 
 
-def calculate_cvar(returns):
-    var = calculate_var(returns)
+def calculate_cvar(returns, confidence=0.95):
+    var = calculate_var(returns, confidence)
     cvar = -returns[returns <= -var].mean()
     return cvar
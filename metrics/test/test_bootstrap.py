@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from scipy.stats import t as student_t
+from metrics.Bootstrap import bootstrap_cost_benefit
+
+
+def simulated_results(n_paths=4000):
+    rng = np.random.default_rng(3)
+    common = rng.normal(0.08, 0.1, n_paths)
+    irr = np.stack([common, 0.9 * common + 0.01, common + rng.normal(0, 0.02, n_paths)])
+    irr[2, 17] = np.nan
+    return SimpleNamespace(irr=irr, names=["A", "B", "C"])
+
+
+def test_bootstrap_does_not_depend_on_n_workers():
+    results = simulated_results()
+    options = dict(n_resamples=200, resamples_per_job=25, random_seed=7)
+
+    serial = bootstrap_cost_benefit(results, n_workers=1, **options)
+    parallel = bootstrap_cost_benefit(results, n_workers=2, **options)
+    for serial_frame, parallel_frame in zip(serial, parallel):
+        pd.testing.assert_frame_equal(serial_frame, parallel_frame)
+
+    # A different seed gives different intervals
+    other = bootstrap_cost_benefit(results, n_workers=1, **{**options, "random_seed": 8})
+    assert not other[0]["Lower"].equals(serial[0]["Lower"])
+
+
+def test_batch_means_with_equal_batches_gives_textbook_interval():
+    results = simulated_results()
+    results.irr[2, 17] = 0.0
+    n_batches = 20
+
+    metric_intervals, pairwise = bootstrap_cost_benefit(
+        results, method="batch_means", n_batches=n_batches
+    )
+
+    batch_means = results.irr.reshape(3, n_batches, -1).mean(axis=-1)
+    half_width = (
+        student_t.ppf(0.975, n_batches - 1)
+        * batch_means.std(axis=1, ddof=1)
+        / np.sqrt(n_batches)
+    )
+    mean_rows = metric_intervals[metric_intervals["Metric"] == "Mean IRR"]
+    assert np.allclose(mean_rows["Estimate"], results.irr.mean(axis=1))
+    assert np.allclose(mean_rows["Upper"] - mean_rows["Estimate"], half_width)
+    assert np.allclose(mean_rows["Estimate"] - mean_rows["Lower"], half_width)
+
+    # The pairwise interval is that of the batch-mean differences
+    difference = batch_means[0] - batch_means[1]
+    row = pairwise[(pairwise["Metric"] == "Mean IRR") & (pairwise["Strategy B"] == "B")].iloc[0]
+    assert np.isclose(
+        row["Upper"] - row["Difference"],
+        student_t.ppf(0.975, n_batches - 1) * difference.std(ddof=1) / np.sqrt(n_batches),
+    )
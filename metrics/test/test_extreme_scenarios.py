@@ -0,0 +1,51 @@
+import numpy as np
+from metrics.ExtremeScenarios import select_tail_paths
+
+
+def reference(irr, n_extreme):
+    """Worst and best path ids from a full sort, NaNs dropped, -1 padded"""
+    order = np.argsort(irr, kind="stable")
+    order = order[~np.isnan(irr[order])]
+    k = min(n_extreme, len(irr))
+    pad = [-1] * max(k - len(order), 0)
+    return np.array(list(order[:k]) + pad), np.array(list(order[max(len(order) - k, 0) :]) + pad)
+
+
+def test_tails_match_a_full_sort_with_nans():
+    rng = np.random.default_rng(11)
+    irrs = rng.normal(0.08, 0.1, (3, 1000))
+    irrs[0, rng.choice(1000, 100, replace=False)] = np.nan
+    irrs[1, :995] = np.nan  # fewer valid paths than n_extreme
+
+    worst, best = select_tail_paths(irrs, n_extreme=20)
+    assert worst.shape == best.shape == (3, 20)
+    for row in range(3):
+        expected_worst, expected_best = reference(irrs[row], 20)
+        assert np.array_equal(worst[row], expected_worst)
+        assert np.array_equal(best[row], expected_best)
+
+    # Five valid paths: both tails hold them all, then padding
+    assert np.array_equal(worst[1][:5], np.argsort(irrs[1])[:5])
+    assert (worst[1][5:] == -1).all() and (best[1][5:] == -1).all()
+
+
+def test_ties_select_the_same_values_as_a_full_sort():
+    rng = np.random.default_rng(12)
+    irrs = np.round(rng.normal(0.08, 0.1, (2, 2000)), 2)
+    irrs[1, ::7] = np.nan
+
+    worst, best = select_tail_paths(irrs, n_extreme=50)
+    for row in range(2):
+        expected_worst, expected_best = reference(irrs[row], 50)
+        # Tied paths may be picked in another order, but the values and
+        # their sorted order are those of the full sort
+        for selected, expected in ((worst[row], expected_worst), (best[row], expected_best)):
+            assert len(set(selected)) == len(selected)
+            assert np.array_equal(irrs[row, selected], irrs[row, expected])
+
+
+def test_more_extremes_than_paths():
+    irrs = np.array([[0.3, np.nan, -0.1, 0.2]])
+    worst, best = select_tail_paths(irrs, n_extreme=10)
+    assert worst.tolist() == [[2, 3, 0, -1]]
+    assert best.tolist() == [[2, 3, 0, -1]]
@@ -0,0 +1,82 @@
+import numpy as np
+from metrics.IRR import calculate_irr, solve_irr
+from model.Heston import HestonModel
+from strategies.NoHedging import NoHedging
+from strategies.PartialHedge import PartialForwardHedging
+
+PARAMS = {
+    "v0": 0.0064,
+    "theta": 0.0081,
+    "kappa": 1.5,
+    "sigma": 0.3,
+    "rho": -0.3,
+    "mu": 0.0,
+    "usd_ir": 0.035,
+    "eur_ir": 0.0215,
+}
+CASH_FLOWS = {
+    "2025-10-01": -10000000,
+    "2026-10-01": 1000000,
+    "2027-10-01": 1000000,
+    "2029-10-01": 1000000,
+    "2030-10-01": 11000000,
+}
+TIMES = np.array([0.0, 1.0, 2.0, 4.0, 5.0])
+
+
+def baseline_irr(cash_flows, times):
+    """The original per-path bisection on [-0.5, 1.0], without its filter"""
+    irrs = np.zeros(cash_flows.shape[0])
+    for j in range(cash_flows.shape[0]):
+
+        def f(r):
+            return np.sum(cash_flows[j, :] / (1 + r) ** np.array(times))
+
+        a, b = -0.5, 1.0
+        for _ in range(50):
+            m = (a + b) / 2
+            if f(a) * f(m) <= 0:
+                b = m
+            else:
+                a = m
+        irrs[j] = (a + b) / 2
+    return irrs
+
+
+def simulated_cash_flows(n_paths=3000):
+    model = HestonModel(S0=1.16, params=dict(PARAMS), n_paths=n_paths, dt=1 / 12)
+    _, spot, _ = model.simulate(max(TIMES), observation_times=TIMES[1:])
+    # The first flow is at t = 0, at today's spot
+    spot = np.vstack([np.full(n_paths, 1.16), spot])
+    forward_rates = dict(zip(CASH_FLOWS, 1.16 * np.exp((model.rd - model.rf) * TIMES)))
+    return np.vstack(
+        [
+            NoHedging(CASH_FLOWS).calculate_usd_cf(spot, forward_rates),
+            PartialForwardHedging(CASH_FLOWS).calculate_usd_cf(spot, forward_rates),
+        ]
+    )
+
+
+def test_solve_irr_matches_baseline_bisection():
+    cash_flows = simulated_cash_flows()
+    irrs, converged = solve_irr(cash_flows, TIMES)
+    expected = baseline_irr(cash_flows, TIMES)
+
+    # The docstring's tolerance, on every path with a root in the bracket
+    assert converged.mean() > 0.99
+    assert np.allclose(irrs[converged], expected[converged], rtol=0, atol=1e-10)
+    assert np.isnan(irrs[~converged]).all()
+
+
+def test_paths_without_a_root_are_reported():
+    cash_flows = simulated_cash_flows(200)
+    # All flows positive: the NPV never changes sign on the bracket
+    cash_flows[7] = np.abs(cash_flows[7])
+
+    irrs, converged = solve_irr(cash_flows, TIMES)
+    assert not converged[7] and np.isnan(irrs[7])
+
+    kept, path_ids = calculate_irr(cash_flows, TIMES, return_path_ids=True)
+    assert 7 not in path_ids
+    assert len(kept) == len(path_ids) == np.count_nonzero(converged)
+    assert np.array_equal(kept, irrs[path_ids])
@@ -0,0 +1,18 @@
+import numpy as np
+from metrics.MultipleCapital import calculate_multiple_on_capital
+from portfolio.BatchRunner import load_schedules
+
+
+def test_multiple_counts_every_capital_call():
+    # Fund III calls 5M twice and distributes 17.5M
+    schedule = load_schedules("data/schedules.csv")["Fund III"]
+    cash_flows = np.array([list(schedule.values())])
+
+    assert np.allclose(calculate_multiple_on_capital(cash_flows), 1.75)
+
+
+def test_multiple_of_single_call_schedule():
+    schedule = load_schedules("data/schedules.csv")["Fund I"]
+    cash_flows = np.array([list(schedule.values())]) * np.array([[1.0], [1.2]])
+
+    assert np.allclose(calculate_multiple_on_capital(cash_flows), 1.4)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from metrics.Results import StrategyResults
+
+TIMES = np.array([0.0, 1.0, 2.0, 5.0])
+
+
+def make_results(n_paths=500):
+    rng = np.random.default_rng(5)
+    inflows = 100 * np.exp(rng.normal(0.2, 0.3, (n_paths, 1)))
+    unhedged = np.hstack([np.full((n_paths, 1), -100.0), np.full((n_paths, 2), 5.0), inflows])
+    hedged = unhedged.copy()
+    hedged[:, -1] = 125.0
+    # No root on the bracket: NaN IRR that must survive the round trip
+    unhedged[3] = [-100.0, 0.0, 0.0, 1.0]
+    return StrategyResults.from_cash_flows(
+        [("No Hedge", unhedged), ("Static Forward Hedge", hedged)], TIMES
+    )
+
+
+def assert_same_results(loaded, results):
+    assert loaded.names == results.names
+    for name in ("irr", "usd_cf", "multiples"):
+        assert np.array_equal(getattr(loaded, name), getattr(results, name), equal_nan=True)
+    pd.testing.assert_frame_equal(loaded.summary, results.summary, check_dtype=False)
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".parquet"])
+def test_save_and_load_round_trip(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    results = make_results()
+    assert np.isnan(results.irr[0, 3])
+
+    path = tmp_path / "results" / f"run{suffix}"
+    results.save(path)
+    assert_same_results(StrategyResults.load(path), results)
@@ -0,0 +1,34 @@
+import copy
+import numpy as np
+import pytest
+from metrics.Sensitivity import bumped_parameters, simulate_bumped
+from model.Heston import HestonModel
+
+PARAMS = {
+    "v0": 0.0064,
+    "theta": 0.0081,
+    "kappa": 1.5,
+    "sigma": 0.3,
+    "rho": -0.3,
+    "mu": 0.0,
+    "usd_ir": 0.035,
+    "eur_ir": 0.0215,
+}
+TIMES = [0.25, 0.75, 1.5]
+
+
+@pytest.mark.parametrize("scheme, sampler", [("euler", "pseudo"), ("qe", "pseudo"), ("qe", "sobol")])
+def test_batched_models_match_scalar_runs(scheme, sampler):
+    model = HestonModel(
+        S0=1.16, params=dict(PARAMS), n_paths=512, scheme=scheme, sampler=sampler, dt=1 / 52
+    )
+    values = bumped_parameters(model)
+    spot = simulate_bumped(model, values, max(TIMES), TIMES)
+    assert spot.shape == (len(TIMES), len(values["v0"]), model.n_paths)
+
+    for k in range(spot.shape[1]):
+        scalar = copy.copy(model)
+        for name, column in values.items():
+            setattr(scalar, name, column[k])
+        _, expected, _ = scalar.simulate_paths(max(TIMES), observation_times=TIMES)
+        assert np.array_equal(spot[:, k], expected), f"model {k} differs from its scalar run"
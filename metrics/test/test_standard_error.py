@@ -0,0 +1,15 @@
+import numpy as np
+from metrics.StandardError import calculate_standard_error
+
+
+def test_non_converged_paths_do_not_move_batches():
+    # Antithetic pairs: each pair sums to zero, so every batch mean is zero
+    # as long as no pair is split across batches
+    rng = np.random.default_rng(0)
+    half = rng.standard_normal(500)
+    values = np.stack([half, -half], axis=1).ravel()
+    assert calculate_standard_error(values, n_batches=10) < 1e-12
+
+    # Dropping a whole pair keeps every other pair together
+    values[[6, 7]] = np.nan
+    assert calculate_standard_error(values, n_batches=10) < 1e-12
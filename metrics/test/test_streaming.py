@@ -0,0 +1,93 @@
+import numpy as np
+from metrics.IRR import solve_irr
+from metrics.MultipleCapital import calculate_multiple_on_capital
+from metrics.Streaming import (
+    RunningMoments,
+    StreamingRiskMetrics,
+    stream_strategy_metrics,
+    strategy_cash_flows,
+)
+from metrics.VAR import calculate_cvar, calculate_var
+from model.Heston import HestonModel
+from strategies.DynamicDelta import DynamicDeltaHedging
+from strategies.NoHedging import NoHedging
+
+PARAMS = {
+    "v0": 0.0064,
+    "theta": 0.0081,
+    "kappa": 1.5,
+    "sigma": 0.3,
+    "rho": -0.3,
+    "mu": 0.0,
+    "usd_ir": 0.035,
+    "eur_ir": 0.0215,
+}
+CASH_FLOWS = {"2025-10-01": -100.0, "2026-10-01": 10.0, "2028-10-01": 10.0, "2030-10-01": 110.0}
+TIMES = np.array([0.0, 1.0, 3.0, 5.0])
+
+
+def test_running_moments_merge_like_numpy():
+    values = np.random.default_rng(0).normal(size=1001)
+    moments = RunningMoments()
+    for chunk in np.array_split(values, 7):
+        part = RunningMoments()
+        part.update(chunk)
+        moments.merge(part)
+
+    assert moments.count == len(values)
+    assert np.isclose(moments.mean, values.mean(), rtol=1e-13)
+    assert np.isclose(moments.std(), values.std(), rtol=1e-13)
+    assert np.isclose(moments.std(ddof=1), values.std(ddof=1), rtol=1e-13)
+
+
+def test_merged_chunks_match_in_memory_metrics():
+    rng = np.random.default_rng(1)
+    irr = rng.standard_t(4, size=5003) * 0.05
+    irr[rng.choice(len(irr), 40, replace=False)] = np.nan
+    multiples = 1 + rng.normal(size=len(irr))
+
+    # One accumulator per chunk, as separate workers would build them
+    boundaries = [0, 700, 2100, 2101, 4000, len(irr)]
+    merged = StreamingRiskMetrics(len(irr), confidence=0.95, n_extreme=50)
+    for start, stop in zip(boundaries[:-1], boundaries[1:]):
+        chunk = StreamingRiskMetrics(len(irr), confidence=0.95, n_extreme=50)
+        chunk.update(irr[start:stop], multiples[start:stop], np.arange(start, stop))
+        merged.merge(chunk)
+
+    summary = merged.summary()
+    valid = irr[~np.isnan(irr)]
+    assert summary["Paths"] == len(valid)
+    assert summary["Not Converged"] == 40
+    assert np.isclose(summary["VaR"], calculate_var(valid), rtol=1e-14)
+    assert np.isclose(summary["CVaR"], calculate_cvar(valid), rtol=1e-14)
+    assert np.isclose(summary["Mean IRR"], valid.mean(), rtol=1e-13)
+    assert np.isclose(summary["IRR Std"], valid.std(), rtol=1e-13)
+    assert np.isclose(summary["Mean Multiple"], multiples.mean(), rtol=1e-13)
+
+    # NaNs sort last, so the first ids of a full argsort are the worst paths
+    order = np.argsort(irr, kind="stable")
+    assert np.array_equal(summary["worst_paths"], order[:50])
+    assert np.array_equal(summary["best_paths"], order[len(valid) - 50 : len(valid)][::-1])
+
+
+def test_stream_matches_in_memory_pipeline():
+    model = HestonModel(S0=1.16, params=dict(PARAMS), n_paths=3000, n_chunks=3, dt=1 / 12)
+    forward_rates = dict(zip(CASH_FLOWS, 1.16 * np.exp((model.rd - model.rf) * TIMES)))
+    strategies = [NoHedging(CASH_FLOWS), DynamicDeltaHedging(CASH_FLOWS)]
+
+    streamed = stream_strategy_metrics(model, strategies, TIMES, forward_rates)
+
+    _, spot, _ = model.simulate(max(TIMES), observation_times=TIMES)
+    for name, usd_cf in strategy_cash_flows(strategies, spot, forward_rates):
+        irr, _ = solve_irr(usd_cf, TIMES)
+        valid = irr[~np.isnan(irr)]
+        summary = streamed[name].summary()
+
+        assert np.isclose(summary["VaR"], calculate_var(valid), rtol=1e-14)
+        assert np.isclose(summary["CVaR"], calculate_cvar(valid), rtol=1e-14)
+        assert np.isclose(summary["Mean IRR"], valid.mean(), rtol=1e-13)
+        assert np.isclose(summary["IRR Std"], valid.std(), rtol=1e-13)
+        assert np.isclose(
+            summary["Mean Multiple"], calculate_multiple_on_capital(usd_cf).mean(), rtol=1e-13
+        )
+        assert np.array_equal(summary["worst_paths"], np.argsort(irr, kind="stable")[:100])
@@ -0,0 +1,22 @@
+import numpy as np
+from metrics.Results import StrategyResults
+from metrics.VAR import calculate_cvar, calculate_var
+
+
+def test_cvar_is_the_mean_beyond_the_var_at_any_confidence():
+    returns = np.random.default_rng(0).normal(0.05, 0.1, 20000)
+
+    for confidence in (0.9, 0.95, 0.99):
+        var = calculate_var(returns, confidence)
+        cvar = calculate_cvar(returns, confidence)
+        assert np.isclose(cvar, -returns[returns <= -var].mean())
+        assert cvar > var
+
+
+def test_summary_cvar_uses_the_summary_confidence():
+    irr = np.random.default_rng(1).normal(0.05, 0.1, (1, 10000))
+    usd_cf = np.ones((1, 10000, 2)) * [-1.0, 1.1]
+
+    summary = StrategyResults(["A"], irr, usd_cf, confidence=0.99).summary.iloc[0]
+    assert np.isclose(summary["VaR"], calculate_var(irr[0], 0.99))
+    assert np.isclose(summary["CVaR"], calculate_cvar(irr[0], 0.99))
@@ -0,0 +1,88 @@
+import numpy as np
+from bisect import bisect_left, insort
+from scipy.special import ndtri
+
+
+def bisection_order(points):
+    """Order points for a Brownian bridge: last point first, then midpoints"""
+    order = [points[-1]]
+    ranges = [(-1, len(points) - 1)]
+    while ranges:
+        lo, hi = ranges.pop(0)
+        if hi - lo < 2:
+            continue
+        mid = (lo + hi) // 2
+        order.append(points[mid])
+        ranges += [(lo, mid), (mid, hi)]
+    return order
+
+
+def sobol_normal_blocks(dt, n_paths, rng, observation_index, block_steps):
+    """
+    Yield standard normal increments of shape (2, m, n_paths), step by step
+    in blocks, built from scrambled Sobol points through a Brownian bridge.
+    dt holds the size of every step, and each increment is normalised by it.
+
+    The observed steps are constructed first, so they take the leading (best
+    distributed) Sobol dimensions. Extra skeleton points every block_steps
+    steps keep each block small, and the steps between skeleton points are
+    filled with a pseudo-random Brownian bridge. Memory is
+    O(n_paths * (n_skeleton + block_steps)) rather than O(n_paths * n_steps).
+    n_paths must be a power of 2, which keeps the Sobol points balanced.
+    """
+    n_steps = len(dt)
+    times = np.concatenate([[0.0], np.cumsum(dt)])
+    observed = sorted(
+        {int(index) for index in observation_index if 0 < index <= n_steps}
+    )
+    skeleton = sorted(
+        set(observed) | set(range(block_steps, n_steps, block_steps)) | {n_steps}
+    )
+    order = (bisection_order(observed) if observed else []) + [
+        point for point in skeleton if point not in observed
+    ]
+
+    # Sobol dimensions 2k and 2k + 1 drive the two Brownian motions at the
+    # k-th constructed point
+    from scipy.stats import qmc
+
+    sobol = qmc.Sobol(2 * len(order), scramble=True, rng=rng)
+    U = np.clip(sobol.random_base2(int(np.log2(n_paths))), 1e-12, 1 - 1e-12)
+    Z = ndtri(U).T.reshape(len(order), 2, n_paths)
+
+    # Brownian bridge over the skeleton
+    W = {0: np.zeros((2, n_paths))}
+    known = [0]
+    for k, point in enumerate(order):
+        position = bisect_left(known, point)
+        left = known[position - 1]
+        elapsed = times[point] - times[left]
+        if position == len(known):
+            W[point] = W[left] + np.sqrt(elapsed) * Z[k]
+        else:
+            right = known[position]
+            span = times[right] - times[left]
+            weight = elapsed / span
+            W[point] = (
+                W[left]
+                + weight * (W[right] - W[left])
+                + np.sqrt(elapsed * (times[right] - times[point]) / span) * Z[k]
+            )
+        insort(known, point)
+
+    # Fill the steps between skeleton points with a conditioned random walk
+    for left, right in zip([0] + skeleton[:-1], skeleton):
+        m = right - left
+        step_sd = np.sqrt(dt[left:right])[None, :, None]
+        walk = (rng.standard_normal((2, m, n_paths)) * step_sd).cumsum(axis=1)
+        weight = ((times[left + 1 : right + 1] - times[left]) / (times[right] - times[left]))[
+            None, :, None
+        ]
+        path = (
+            W[left][:, None, :]
+            + walk
+            - weight * walk[:, -1:, :]
+            + weight * (W[right] - W[left])[:, None, :]
+        )
+        yield np.diff(np.concatenate([W[left][:, None, :], path], axis=1), axis=1) / step_sd
+        del W[left]
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+
+def fingerprint(payload):
+    """SHA-256 of a canonical JSON form of nested dicts, sequences and numbers"""
+
+    def canonical(value):
+        if isinstance(value, dict):
+            return {str(key): canonical(value[key]) for key in sorted(value)}
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return [canonical(item) for item in value]
+        if isinstance(value, (float, np.floating)):
+            return repr(float(value))
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        return str(value)
+
+    payload = json.dumps(canonical(payload), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CalibrationCache:
+    """
+    Calibrated Heston parameters keyed by a fingerprint of the market data,
+    initial parameters, bounds and pricer settings.
+
+    Entries are kept in least-recently-used order and the oldest is evicted
+    once max_entries is reached. A miss warm-starts the calibration from the
+    entry whose market data is closest, among those whose parameters satisfy
+    the Feller condition. Entries that fail it are still cached (a hit
+    returns them with feller False) but never seed another calibration.
+    """
+
+    def __init__(self, path="model/calibration_cache.pkl", max_entries=32):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+        if self.path.is_file():
+            with open(self.path, "rb") as file:
+                self.entries = pickle.load(file)
+
+    @staticmethod
+    def fingerprint(market_data, initial_params, bounds, pricer_settings):
+        """Stable hash of everything that determines a calibration"""
+        return fingerprint(
+            {
+                "market_data": market_data,
+                "initial_params": initial_params,
+                "bounds": bounds,
+                "pricer_settings": pricer_settings,
+            }
+        )
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.save()
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.save()
+
+    def nearest(self, market_data):
+        """Feller-satisfying entry whose market data has the smallest relative distance"""
+        best_entry, best_distance = None, np.inf
+        for entry in self.entries.values():
+            if not entry.get("feller", True):
+                continue
+            cached = entry["market_data"]
+            shared = [key for key in market_data if key in cached]
+            if not shared:
+                continue
+
+            new = np.array([market_data[key] for key in shared], dtype=float)
+            old = np.array([cached[key] for key in shared], dtype=float)
+            scale = np.maximum(np.abs(old), 1e-12)
+            distance = np.sum(((new - old) / scale) ** 2)
+
+            if distance < best_distance:
+                best_entry, best_distance = entry, distance
+
+        return best_entry
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as file:
+            pickle.dump(self.entries, file)
+        os.replace(tmp_path, self.path)
+
+    def calibrate(self, model, market_data, initial_params, pricer="analytic"):
+        """
+        Set the model to cached parameters for these inputs, calibrating (and
+        caching the result) on a miss.
+        """
+        key = self.fingerprint(
+            market_data,
+            initial_params,
+            model.calibration_bounds,
+            model.pricer_settings(pricer),
+        )
+
+        entry = self.get(key)
+        if entry is not None:
+            print("Loaded calibrated parameters from cache")
+            model.set_parameters(dict(entry["params"]))
+            return entry
+
+        nearest = self.nearest(market_data)
+        initial_guess = nearest["params"] if nearest is not None else None
+
+        calibration = model.calibrate(
+            market_data, pricer=pricer, initial_guess=initial_guess
+        )
+
+        entry = {
+            **calibration,
+            "market_data": dict(market_data),
+            "warm_start": initial_guess is not None,
+            "timestamp": datetime.now().isoformat(),
+        }
+        if calibration["success"]:
+            self.put(key, entry)
+
+        return entry
@@ -1,12 +1,66 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
-from scipy.optimize import minimize
-import pickle
+from scipy.special import ndtr
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from helpers.black_scholes_prices import black_scholes_price
+from helpers.variance_reduction import monte_carlo_estimate
+from model.BrownianBridge import sobol_normal_blocks
+
+# Worker pools by (process id, n_workers), shared by every model and its
+# copies so repeated simulations (calibration, bumps, strategies) reuse the
+# running workers. Keyed by process so a forked child never uses its
+# parent's pool.
+_pools = {}
+
+
+def worker_pool(n_workers):
+    """Process pool of n_workers, started on first use and kept until exit"""
+    key = (os.getpid(), n_workers)
+    if key not in _pools:
+        _pools[key] = ProcessPoolExecutor(max_workers=n_workers)
+    return _pools[key]
 
 
 class HestonModel:
-    def __init__(self, S0, params):
+    # Parameters fitted by calibrate and their bounds
+    calibrated_names = ("v0", "theta", "kappa", "sigma", "rho")
+    calibration_bounds = (
+        (1e-4, 0.25),  # v0
+        (1e-4, 0.25),  # theta
+        (0.1, 5.0),  # kappa
+        (0.1, 1.0),  # sigma
+        (-0.9, 0.0),  # rho
+    )
+
+    # Gauss-Legendre nodes for the Lewis integral, truncated at u = 1000
+    _lewis_nodes, _lewis_weights = np.polynomial.legendre.leggauss(512)
+    _lewis_nodes = 500.0 * (_lewis_nodes + 1.0)
+    _lewis_weights = 500.0 * _lewis_weights
+
+    # Time steps of Brownian increments drawn at once by the path generator
+    _block_steps = 64
+
+    # Default number of paths per chunk when n_chunks is not set
+    _chunk_paths = 25000
+
+    # Default number of independent scrambles for the Sobol sampler
+    _sobol_scrambles = 16
+
+    def __init__(
+        self,
+        S0,
+        params,
+        n_paths=10000,
+        n_workers=1,
+        n_chunks=None,
+        scheme="euler",
+        dt=1 / 252,
+        antithetic=False,
+        sampler="pseudo",
+        path_store=None,
+    ):
 
         self.S0 = S0
         self.rd = params["usd_ir"]
@@ -16,6 +70,47 @@ class HestonModel:
 
         self.random_seed = 42
 
+        # Paths are simulated in independent chunks, optionally on a process
+        # pool. Results depend on the seed and chunk count, never on n_workers;
+        # the default chunk count depends on the path count alone.
+        self.n_paths = n_paths
+        self.n_workers = n_workers
+        self.n_chunks = n_chunks
+
+        # "euler" needs daily steps, "qe" (Andersen) stays accurate at
+        # weekly or monthly steps
+        if scheme not in ("euler", "qe"):
+            raise ValueError(f"Unknown discretisation scheme: {scheme}")
+        self.scheme = scheme
+        self.dt = dt
+
+        # Antithetic paths are stored as adjacent pairs (2i, 2i + 1)
+        self.antithetic = antithetic
+
+        # "sobol" uses randomised QMC with a Brownian bridge; every chunk is
+        # an independent scramble and error estimates come from across chunks
+        if sampler not in ("pseudo", "sobol"):
+            raise ValueError(f"Unknown sampler: {sampler}")
+        if sampler == "sobol" and antithetic:
+            raise ValueError("Antithetic sampling is not used with the Sobol sampler")
+        self.sampler = sampler
+
+        # Each scramble must be a power of 2 for Sobol balance, so the path
+        # count is rounded to the nearest n_scrambles * 2^m
+        if sampler == "sobol":
+            n_scrambles = self.n_chunks or self._sobol_scrambles
+            scramble_paths = 2 ** max(int(round(np.log2(n_paths / n_scrambles))), 0)
+            if n_scrambles * scramble_paths != n_paths:
+                warnings.warn(
+                    f"Sobol sampler: {n_paths} paths rounded to {n_scrambles * scramble_paths} "
+                    f"({n_scrambles} scrambles of {scramble_paths})",
+                    stacklevel=2,
+                )
+            self.n_paths = n_scrambles * scramble_paths
+
+        # Optional model.PathStore serving repeated simulations from disk
+        self.path_store = path_store
+
     def set_parameters(self, params):
         """Set model parameters"""
         self.v0 = params["v0"]  # Initial variance
@@ -29,148 +124,567 @@ class HestonModel:
         self.vol0 = np.sqrt(self.v0)
         self.long_term_vol = np.sqrt(self.theta)
 
-    def simulate(self, T):
-        """Euler Simulation: Returns time array, spot paths and volatility"""
+    def simulate(
+        self, T, observation_times=None, n_paths=None, return_brownian=False, use_store=True
+    ):
+        """
+        Simulation: Returns time array, spot paths and volatility
+
+        With a path_store the arrays are read memory-mapped from an earlier
+        identical simulation when there is one (see simulate_paths).
+        """
+        if self.path_store is not None and use_store:
+            return self.path_store.simulate(
+                self, T, observation_times, n_paths, return_brownian
+            )
+        return self.simulate_paths(T, observation_times, n_paths, return_brownian)
+
+    def simulate_paths(self, T, observation_times=None, n_paths=None, return_brownian=False):
+        """
+        Simulate in memory: Returns time array, spot paths and volatility
+
+        The step size is the model dt rounded so that it divides T, and the
+        variance is discretised with the model scheme (Euler or Andersen QE).
 
-        np.random.seed(self.random_seed)
+        With observation_times those times are added to the grid as nodes
+        (see time_grid) and only they are kept, so memory is
+        O(n_paths * n_observations) instead of O(n_paths * n_steps).
 
-        n_paths = 10000
-        dt = 1 / 252
-        n_steps = int(T / dt)
+        The paths are split into chunks, each with its own stream spawned from
+        SeedSequence(random_seed), and the chunks are run on the shared pool
+        of n_workers processes (see map_chunks).
 
+        With return_brownian the Brownian motion driving the spot is returned
+        as a fourth array, for use as a control variate.
+        """
+
+        t, jobs = self.simulation_jobs(T, observation_times, n_paths)
+        chunks = list(self.map_chunks(self.simulate_chunk, jobs))
+
+        S = np.concatenate([chunk[0] for chunk in chunks], axis=-1)
+        v = np.concatenate([chunk[1] for chunk in chunks], axis=-1)
+
+        if return_brownian:
+            W = np.concatenate([chunk[2] for chunk in chunks], axis=-1)
+            return t, S, np.sqrt(v), W
+
+        return t, S, np.sqrt(v)
+
+    def map_chunks(self, function, *iterables):
+        """
+        map(function, *iterables) over simulation chunks, in order. With
+        n_workers > 1 and more than one chunk it runs on worker_pool, which
+        stays up between calls instead of being started for each one.
+        """
+        iterables = [list(iterable) for iterable in iterables]
+        if self.n_workers > 1 and len(iterables[0]) > 1:
+            return worker_pool(self.n_workers).map(function, *iterables)
+        return map(function, *iterables)
+
+    def time_grid(self, T, observation_times=None, tol=1e-9):
+        """
+        Simulation grid: every dt (rounded so that it divides T) plus every
+        observation time as a node of its own, so observations are exact
+        whatever the step size. A grid node within tol of an observation
+        time is moved onto it rather than doubled.
+
+        Returns the node times, the step sizes and the index of each
+        observation time. Steps between two regular nodes are exactly
+        T / n_steps.
+        """
+        n_steps = max(int(round(T / self.dt)), 1)
         t = np.linspace(0, T, n_steps + 1)
-        S = np.zeros((n_steps + 1, n_paths))
-        v = np.zeros((n_steps + 1, n_paths))
+        regular = np.ones(len(t), dtype=bool)
+
+        if observation_times is None:
+            return t, np.full(n_steps, T / n_steps), np.arange(n_steps + 1)
+
+        observation_times = np.asarray(observation_times, dtype=float)
+        nearest = np.abs(t[:, None] - observation_times).argmin(axis=0)
+        snapped = np.abs(t[nearest] - observation_times) <= tol
+        t[nearest[snapped]] = observation_times[snapped]
+
+        inserted = np.setdiff1d(observation_times[~snapped], t)
+        t = np.concatenate([t, inserted])
+        regular = np.concatenate([regular, np.zeros(len(inserted), dtype=bool)])
+        order = np.argsort(t, kind="stable")
+        t, regular = t[order], regular[order]
+
+        dt = np.diff(t)
+        dt[regular[:-1] & regular[1:]] = T / n_steps
+        return t, dt, np.searchsorted(t, observation_times)
+
+    def simulation_jobs(self, T, observation_times=None, n_paths=None):
+        """
+        Times of the kept grid rows and one job per chunk of paths, so callers
+        can simulate chunk by chunk (see simulate_chunk) in their own workers.
+        A job is (n_steps, step sizes, observation_index, n_paths, seed).
+        """
+        n_paths = n_paths or self.n_paths
+        if self.antithetic and n_paths % 2:
+            raise ValueError("Antithetic sampling needs an even number of paths")
+
+        t, dt, observation_index = self.time_grid(T, observation_times)
+        n_steps = len(dt)
+
+        chunk_sizes = self.chunk_sizes(n_paths)
+        chunk_seeds = np.random.SeedSequence(self.random_seed).spawn(len(chunk_sizes))
+
+        jobs = [
+            (n_steps, dt, observation_index, chunk_paths, seed)
+            for chunk_paths, seed in zip(chunk_sizes, chunk_seeds)
+        ]
 
-        S[0:] = self.S0
-        v[0:] = self.v0
+        return t[observation_index], jobs
+
+    def chunk_sizes(self, n_paths=None):
+        """Number of paths in each simulation chunk (Sobol scramble)"""
+        n_paths = n_paths or self.n_paths
+
+        if self.sampler == "sobol":
+            n_scrambles = self.n_chunks or self._sobol_scrambles
+            scramble_paths = n_paths // n_scrambles
+            if (
+                scramble_paths * n_scrambles != n_paths
+                or scramble_paths & (scramble_paths - 1)
+            ):
+                raise ValueError(
+                    f"The Sobol sampler needs {n_scrambles} scrambles of a power of 2 "
+                    f"paths each, got {n_paths} paths"
+                )
+            return [scramble_paths] * n_scrambles
+
+        n_chunks = self.n_chunks or -(-n_paths // self._chunk_paths)
+
+        if self.antithetic:
+            pairs = np.arange(n_paths // 2)
+            return [2 * len(chunk) for chunk in np.array_split(pairs, min(n_chunks, len(pairs)))]
+
+        paths = np.arange(n_paths)
+        return [len(chunk) for chunk in np.array_split(paths, min(n_chunks, n_paths))]
+
+    def simulate_chunk(self, job):
+        """
+        Simulate one chunk of paths, keeping only the observed rows.
+        Returns spot, variance and the spot Brownian motion.
+        """
+        n_steps, dt, observation_index, n_paths, seed = job
+
+        rows_at_step = {}
+        for row, index in enumerate(observation_index):
+            rows_at_step.setdefault(index, []).append(row)
+
+        S = v = W = None
+        for index, S_t, v_t, W_t in self.step_chunk(job):
+            if S is None:
+                # (n_models, n_paths) per step when the parameters are arrays
+                S, v, W = (np.zeros((len(observation_index),) + S_t.shape) for _ in range(3))
+            for row in rows_at_step.get(index, ()):
+                S[row, :] = S_t
+                v[row, :] = v_t
+                W[row, :] = W_t
+
+        return S, v, W
+
+    def step_chunk(self, job):
+        """
+        Walk one chunk of paths along the full time grid, yielding step
+        index, spot, variance and spot Brownian motion. Only the current step
+        is held, so path-dependent consumers can stream alongside the
+        simulator; the observed rows match simulate_chunk.
+        """
+        n_steps, dt, observation_index, n_paths, seed = job
+        rng = np.random.default_rng(seed)
+        yield from self._path_steps(n_steps, n_paths, dt, rng, observation_index)
+
+    def _path_steps(self, n_steps, n_paths, dt, rng, observation_index=()):
+        """
+        Yield step index, spot, variance and the Brownian motion driving the
+        spot, drawing increments in blocks. dt holds the size of every step.
+        """
+        step_fn = self._qe_step if self.scheme == "qe" else self._euler_step
+
+        # Under QE the spot is driven by rho * Z2 + sqrt(1 - rho^2) * Z1
+        if self.scheme == "qe":
+            spot_loadings = (np.sqrt(1 - self.rho**2), self.rho)
+        else:
+            spot_loadings = (1.0, 0.0)
+
+        # Parameters given as (n_models, 1) columns simulate every model on
+        # the same normals, with the models along a leading axis
+        v = np.zeros(n_paths) + np.asarray(self.v0, dtype=float)
+        S = np.full(v.shape, float(self.S0))
+        W = np.zeros(v.shape)
+        yield 0, S, v, W
+
+        block_start = 0
+        for Z in self._normal_blocks(dt, n_paths, rng, observation_index):
+            block = Z.shape[1]
+            for step in range(block):
+                step_dt = dt[block_start + step]
+                S, v = step_fn(S, v, Z[0, step], Z[1, step], step_dt)
+                W = W + np.sqrt(step_dt) * (
+                    spot_loadings[0] * Z[0, step] + spot_loadings[1] * Z[1, step]
+                )
+                yield block_start + step + 1, S, v, W
+            block_start += block
+
+    def _normal_blocks(self, dt, n_paths, rng, observation_index):
+        """Independent standard normals for the spot and variance drivers"""
+        n_steps = len(dt)
+        if self.sampler == "sobol":
+            yield from sobol_normal_blocks(
+                dt, n_paths, rng, observation_index, self._block_steps
+            )
+            return
+
+        for block_start in range(0, n_steps, self._block_steps):
+            block = min(self._block_steps, n_steps - block_start)
+
+            if self.antithetic:
+                Z = rng.standard_normal((2, block, n_paths // 2))
+                yield np.stack([Z, -Z], axis=-1).reshape(2, block, n_paths)
+            else:
+                yield rng.standard_normal((2, block, n_paths))
+
+    def _euler_step(self, S, v, Z1, Z2, dt):
+        """Euler step with the variance floored at 1e-10"""
 
         # Generate Brownian Motion Correlation
-        dW1 = np.random.normal(0, np.sqrt(dt), (n_steps, n_paths))
-        dW2 = self.rho * dW1 + np.sqrt(1 - self.rho**2) * np.random.normal(
-            0, np.sqrt(dt), (n_steps, n_paths)
+        dW1 = np.sqrt(dt) * Z1
+        dW2 = self.rho * dW1 + np.sqrt(1 - self.rho**2) * np.sqrt(dt) * Z2
+
+        # prevents negative variance
+        sqrt_v = np.sqrt(np.maximum(v, 1e-10))
+
+        # Spot process
+        S = S * np.exp((self.mu - 0.5 * v) * dt + sqrt_v * dW1)
+
+        # Variance process
+        v = np.maximum(
+            v + self.kappa * (self.theta - v) * dt + self.sigma * sqrt_v * dW2,
+            1e-10,
         )
 
-        # Euler Discretisation
-        for index in range(1, n_steps + 1):
-            #prevents negative variance
-            sqrt_v = np.sqrt(np.maximum(v[index - 1, :], 1e-10))
+        return S, v
 
-            # Variance process
-            v[index, :] = (
-                v[index - 1, :]
-                + self.kappa * (self.theta - v[index - 1, :]) * dt
-                + self.sigma * sqrt_v * dW2[index - 1, :]
-            )
-            v[index, :] = np.maximum(v[index, :], 1e-10)
+    def _qe_step(self, S, v, Z1, Z2, dt, psi_c=1.5):
+        """
+        Andersen (2008) quadratic-exponential step with the martingale
+        corrected log-spot update (gamma1 = gamma2 = 0.5).
 
-            # Spot process
-            S[index, :] = S[index - 1, :] * np.exp(
-                (self.mu - 0.5 * v[index - 1, :]) * dt + sqrt_v * dW1[index - 1, :]
-            )
+        Z2 drives the variance and Z1 the part of the spot move that is
+        independent of it.
+        """
+        kappa, theta, sigma, rho = self.kappa, self.theta, self.sigma, self.rho
 
-        return t, S, np.sqrt(v)
+        # Conditional moments of the next variance
+        ekt = np.exp(-kappa * dt)
+        m = theta + (v - theta) * ekt
+        s2 = (
+            v * sigma**2 * ekt * (1 - ekt) / kappa
+            + theta * sigma**2 * (1 - ekt) ** 2 / (2 * kappa)
+        )
+        psi = s2 / m**2
+        quadratic = psi <= psi_c
+
+        # Quadratic branch: v' = a * (b + Z)^2
+        inv_psi = 2 / np.minimum(psi, psi_c)
+        b2 = inv_psi - 1 + np.sqrt(inv_psi) * np.sqrt(inv_psi - 1)
+        a = m / (1 + b2)
+
+        # Exponential branch: point mass p at zero plus an exponential tail
+        p = (np.maximum(psi, psi_c) - 1) / (np.maximum(psi, psi_c) + 1)
+        beta = (1 - p) / m
+        U = ndtr(Z2)
+        with np.errstate(divide="ignore"):
+            v_exp = np.where(U <= p, 0.0, np.log((1 - p) / (1 - U)) / beta)
+
+        v_next = np.where(quadratic, a * (np.sqrt(b2) + Z2) ** 2, v_exp)
+
+        # Log-spot step
+        K1 = 0.5 * dt * (kappa * rho / sigma - 0.5) - rho / sigma
+        K2 = 0.5 * dt * (kappa * rho / sigma - 0.5) + rho / sigma
+        K3 = 0.5 * dt * (1 - rho**2)
+        K4 = K3
+        A = K2 + 0.5 * K4
+
+        # Martingale correction so that E[S_{t+dt} | S_t] = S_t * exp(mu * dt)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            K0_quadratic = -A * b2 * a / (1 - 2 * A * a) + 0.5 * np.log(1 - 2 * A * a)
+            K0_exponential = -np.log(p + beta * (1 - p) / (beta - A))
+        K0 = np.where(quadratic, K0_quadratic, K0_exponential) - (K1 + 0.5 * K3) * v
+
+        S = S * np.exp(
+            self.mu * dt
+            + K0
+            + K1 * v
+            + K2 * v_next
+            + np.sqrt(K3 * v + K4 * v_next) * Z1
+        )
+
+        return S, v_next
 
-    def calculate_option_price(self, K, T, option_type="call", n_paths=10000):
+    def calculate_option_price(self, K, T, option_type="call", n_paths=None):
         """Calculate option price via Monte Carlo"""
-        _, S, _ = self.simulate(T)
+        return float(self.calculate_option_prices(K, T, option_type, n_paths=n_paths))
+
+    def calculate_option_prices(
+        self,
+        K,
+        T,
+        option_type="call",
+        return_stderr=False,
+        n_paths=None,
+        control_variate=False,
+    ):
+        """
+        Price a grid of options via Monte Carlo from a single simulation.
+
+        K, T and option_type broadcast against each other. The paths are
+        simulated once out to the longest maturity and the terminal spot of
+        each quote is read off at its own maturity.
+
+        With control_variate the discounted forward and the Black-Scholes
+        price of the same option on a GBM driven by the spot Brownian motion
+        (at the expected average Heston variance) are used as controls.
+        Antithetic pairs are respected when the model is antithetic.
+        """
+        K = np.asarray(K, dtype=float)
+        T = np.asarray(T, dtype=float)
+        is_call = np.asarray(option_type) == "call"
+        K, T, is_call = np.broadcast_arrays(K, T, is_call)
+        shape = K.shape
+        K, T, is_call = K.ravel(), T.ravel(), is_call.ravel()
+
+        maturities, maturity_index = np.unique(T, return_inverse=True)
+        _, spot_at_maturities, _, W = self.simulate(
+            maturities[-1],
+            observation_times=maturities,
+            n_paths=n_paths,
+            use_store=False,
+            return_brownian=True,
+        )
 
-        # Terminal spot prices
-        S_T = S[-1, :]
+        # Terminal spot prices for each quote
+        S_T = spot_at_maturities[maturity_index, :]
 
         # Calculate payoff
-        if option_type == "call":
-            payoff = np.maximum(S_T - K, 0)
-        else:
-            payoff = np.maximum(K - S_T, 0)
+        payoff = np.where(
+            is_call[:, None],
+            np.maximum(S_T - K[:, None], 0),
+            np.maximum(K[:, None] - S_T, 0),
+        )
 
         # Discount back
-        price = np.exp(-self.rd * T) * payoff.mean()
+        discount = np.exp(-self.rd * T)[:, None]
+
+        controls, control_means = None, None
+        if control_variate:
+            T_col = T[:, None]
+            sigma_cv = np.sqrt(
+                self.theta
+                + (self.v0 - self.theta) * (1 - np.exp(-self.kappa * T)) / (self.kappa * T)
+            )
+            X_T = self.S0 * np.exp(
+                (self.mu - 0.5 * sigma_cv[:, None] ** 2) * T_col
+                + sigma_cv[:, None] * W[maturity_index, :]
+            )
+            gbm_payoff = np.where(
+                is_call[:, None],
+                np.maximum(X_T - K[:, None], 0),
+                np.maximum(K[:, None] - X_T, 0),
+            )
+            controls = np.stack([discount * S_T, discount * gbm_payoff], axis=-1)
+
+            q = self.rd - self.mu
+            control_means = np.stack(
+                [
+                    self.S0 * np.exp(-q * T),
+                    np.where(
+                        is_call,
+                        black_scholes_price(self.S0, K, T, sigma_cv, self.rd, q, "call"),
+                        black_scholes_price(self.S0, K, T, sigma_cv, self.rd, q, "put"),
+                    ),
+                ],
+                axis=-1,
+            )
 
-        return price
+        replicate_sizes = None
+        if self.sampler == "sobol":
+            replicate_sizes = self.chunk_sizes(n_paths)
 
-    def calibrate(self, market_data, n_paths=10000):
+        price, stderr = monte_carlo_estimate(
+            discount * payoff,
+            controls,
+            control_means,
+            antithetic=self.antithetic,
+            replicate_sizes=replicate_sizes,
+        )
+
+        if not return_stderr:
+            return price.reshape(shape)
+
+        return price.reshape(shape), stderr.reshape(shape)
+
+    def characteristic_function(self, u, T):
+        """
+        Characteristic function of log(S_T / F) with F = S0 * exp(mu * T).
+
+        Uses the Albrecher et al. ("little Heston trap") formulation, which
+        stays on the principal branch of the complex log for long maturities.
+        u may be complex and broadcasts against T.
+        """
+        iu = 1j * u
+        beta = self.kappa - self.rho * self.sigma * iu
+        d = np.sqrt(beta**2 + self.sigma**2 * (iu + u**2))
+        g = (beta - d) / (beta + d)
+        exp_dT = np.exp(-d * T)
+
+        C = (self.kappa * self.theta / self.sigma**2) * (
+            (beta - d) * T - 2 * np.log((1 - g * exp_dT) / (1 - g))
+        )
+        D = ((beta - d) / self.sigma**2) * (1 - exp_dT) / (1 - g * exp_dT)
+
+        return np.exp(C + D * self.v0)
+
+    def calculate_option_price_analytic(self, K, T, option_type="call"):
+        """
+        Semi-analytic Heston price via the Lewis (2001) single-integral formula.
+
+        K, T and option_type broadcast against each other so a whole quote
+        grid is priced in one call. Drift and discounting match
+        calculate_option_price, so the two agree up to Monte Carlo error.
+        """
+        K = np.asarray(K, dtype=float)
+        T = np.asarray(T, dtype=float)
+        is_call = np.asarray(option_type) == "call"
+        K, T, is_call = np.broadcast_arrays(K, T, is_call)
+
+        F = self.S0 * np.exp(self.mu * T)
+        log_moneyness = np.log(F / K)[..., None]
+
+        u = self._lewis_nodes
+        phi = self.characteristic_function(u - 0.5j, T[..., None])
+        integrand = np.real(np.exp(1j * u * log_moneyness) * phi) / (u**2 + 0.25)
+        integral = integrand @ self._lewis_weights
+
+        discount = np.exp(-self.rd * T)
+        call = discount * (F - np.sqrt(F * K) * integral / np.pi)
+        put = call - discount * (F - K)
+
+        price = np.where(is_call, call, put)
+        return price if price.ndim else float(price)
+
+    def pricer_settings(self, pricer="analytic", n_paths=None):
+        """Settings that change calibrated parameters for a given pricer"""
+        if pricer == "analytic":
+            return {"pricer": pricer, "lewis_nodes": len(self._lewis_nodes)}
+
+        return {
+            "pricer": pricer,
+            "n_paths": n_paths or self.n_paths,
+            "n_chunks": self.chunk_sizes(n_paths),
+            "scheme": self.scheme,
+            "dt": self.dt,
+            "antithetic": self.antithetic,
+            "sampler": self.sampler,
+            "random_seed": self.random_seed,
+        }
+
+    def calibrate(
+        self, market_data, n_paths=None, pricer="analytic", initial_guess=None
+    ):
+        """
+        Fit v0, theta, kappa, sigma and rho to the six market quotes.
+
+        initial_guess (a params dict) warm-starts the optimiser. Returns the
+        calibrated params with the objective value, iteration count, success
+        and Feller flags. Parameters that fail the Feller condition are still
+        set, flagged feller False; CalibrationCache never warm-starts from
+        them.
+        """
+
+        quote_keys = [
+            "price_atm_1y_mkt",
+            "price_call_1y_mkt",
+            "price_put_1y_mkt",
+            "price_atm_5y_mkt",
+            "price_call_5y_mkt",
+            "price_put_5y_mkt",
+        ]
+        strikes = np.array(
+            [
+                market_data["F_1y"],
+                market_data["K_call_1y"],
+                market_data["K_put_1y"],
+                market_data["F_5y"],
+                market_data["K_call_5y"],
+                market_data["K_put_5y"],
+            ]
+        )
+        maturities = np.array([1.0, 1.0, 1.0, 5.0, 5.0, 5.0])
+        option_types = np.array(["call", "call", "put", "call", "call", "put"])
+        market_prices = np.array([market_data[key] for key in quote_keys])
 
         def objective_fn(obj_params):
 
-            self.params["v0"] = obj_params[0]
-            self.params["theta"] = obj_params[1]
-            self.params["kappa"] = obj_params[2]
-            self.params["sigma"] = obj_params[3]
-            self.params["rho"] = obj_params[4]
+            for name, value in zip(self.calibrated_names, obj_params):
+                self.params[name] = value
 
             self.set_parameters(self.params)
 
-            model_prices = {
-                "price_atm_1y_mkt": self.calculate_option_price(
-                    market_data["F_1y"], 1.0, "call", n_paths
-                ),
-                "price_call_1y_mkt": self.calculate_option_price(
-                    market_data["K_call_1y"], 1.0, "call", n_paths
-                ),
-                "price_put_1y_mkt": self.calculate_option_price(
-                    market_data["K_put_1y"], 1.0, "put", n_paths
-                ),
-                "price_atm_5y_mkt": self.calculate_option_price(
-                    market_data["F_5y"], 5.0, "call", n_paths
-                ),
-                "price_call_5y_mkt": self.calculate_option_price(
-                    market_data["K_call_5y"], 5.0, "call", n_paths
-                ),
-                "price_put_5y_mkt": self.calculate_option_price(
-                    market_data["K_put_5y"], 5.0, "put", n_paths
-                ),
-            }
-
-            errors = []
-            for key in model_prices.keys():
-                error = (model_prices[key] - market_data[key]) ** 2
-                errors.append(error)
-
-            total_error = np.sum(errors)
+            if pricer == "analytic":
+                model_prices = self.calculate_option_price_analytic(
+                    strikes, maturities, option_types
+                )
+            else:
+                model_prices = self.calculate_option_prices(
+                    strikes, maturities, option_types, n_paths=n_paths
+                )
 
-            return total_error
+            total_error = np.sum((model_prices - market_prices) ** 2)
 
-        bounds = [
-            (1e-4, 0.25),  # v0
-            (1e-4, 0.25),  # theta
-            (0.1, 5.0),  # kappa
-            (0.1, 1.0),  # sigma
-            (-0.9, 0.0),  # rho
-        ]
+            return total_error
 
         obj_params = [self.v0, self.theta, self.kappa, self.sigma, self.rho]
+        if initial_guess is not None:
+            obj_params = [initial_guess[name] for name in self.calibrated_names]
+        start_params = dict(self.params)
+
+        # scipy.optimize is only needed on a calibration cache miss
+        from scipy.optimize import minimize
 
         result = minimize(
             objective_fn,
             obj_params,
-            bounds=bounds,
+            bounds=self.calibration_bounds,
             method="L-BFGS-B",
             options={"maxiter": 50, "disp": True, "ftol": 1e-6},
         )
 
-        
+        calibrated_params = result.x
+        feller = (
+            2 * calibrated_params[2] * calibrated_params[1] >= calibrated_params[3] ** 2
+        )
+
         if result.success:
             print("Calibrated Successfully")
-            calibrated_params = result.x
-
-            feller = 2 * calibrated_params[2] * calibrated_params[1]
-            sigma_sq = calibrated_params[3] ** 2
-
-            if feller < sigma_sq:
+            if not feller:
                 print("Feller Condition Not Satisfied")
-                return
-
-            self.params["v0"] = calibrated_params[0]
-            self.params["theta"] = calibrated_params[1]
-            self.params["kappa"] = calibrated_params[2]
-            self.params["sigma"] = calibrated_params[3]
-            self.params["rho"] = calibrated_params[4]
-            self.set_parameters(self.params)
-
-            with open("model/calibrated_heston_params.pkl", "wb") as f:
-                pickle.dump(self.params, f)
 
+            for name, value in zip(self.calibrated_names, calibrated_params):
+                self.params[name] = value
         else:
             print("Calibration Failed")
+            self.params.update(start_params)
+
+        self.set_parameters(self.params)
 
+        return {
+            "params": dict(self.params),
+            "objective": float(result.fun),
+            "iterations": int(result.nit),
+            "success": bool(result.success),
+            "feller": bool(feller),
+        }
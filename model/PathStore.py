@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+from model.CalibrationCache import fingerprint
+
+
+class PathStore:
+    """
+    Simulated paths saved as .npy files and reopened memory-mapped, so later
+    runs and worker processes read them zero-copy instead of re-simulating.
+
+    Entries are keyed by everything that determines the paths: model
+    parameters, seed, scheme, dt, sampler, chunking, path count, horizon and
+    observation times. Any parameter change gives a new key, and the old
+    entry ages out. Once the store is over max_bytes the least recently used
+    entries are evicted. Arrays come back read-only.
+    """
+
+    def __init__(self, directory="model/path_store", max_bytes=2 * 2**30):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def describe(model, T, observation_times=None, n_paths=None, return_brownian=False):
+        """Everything that determines a simulate() result"""
+        n_paths = n_paths or model.n_paths
+        return {
+            "S0": model.S0,
+            "params": {
+                name: getattr(model, name)
+                for name in ("v0", "theta", "kappa", "sigma", "rho", "mu", "rd", "rf")
+            },
+            "random_seed": model.random_seed,
+            "scheme": model.scheme,
+            "dt": model.dt,
+            "grid": "observation nodes",
+            "sampler": model.sampler,
+            "antithetic": model.antithetic,
+            "chunk_sizes": model.chunk_sizes(n_paths),
+            "block_steps": model._block_steps,
+            "n_paths": n_paths,
+            "T": T,
+            "observation_times": observation_times,
+            "return_brownian": return_brownian,
+        }
+
+    def entry_path(self, key):
+        return self.directory / key
+
+    def load(self, description):
+        """Memory-mapped arrays of a stored simulation, or None on a miss"""
+        key = fingerprint(description)
+        entry = self.entry_path(key)
+        try:
+            with open(entry / "meta.json") as file:
+                meta = json.load(file)
+            arrays = tuple(
+                np.load(entry / f"{name}.npy", mmap_mode="r") for name in meta["arrays"]
+            )
+        except (OSError, ValueError, KeyError):
+            # Missing or half-written entry
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        os.utime(entry / "meta.json")
+        return arrays
+
+    def save(self, description, arrays):
+        """Write the arrays of a simulation and evict down to the size cap"""
+        key = fingerprint(description)
+        entry = self.entry_path(key)
+        names = ["t", "S", "vol", "W"][: len(arrays)]
+
+        # Storing an entry over the cap would only flush everything else
+        size = int(sum(np.asarray(array).nbytes for array in arrays))
+        if size > self.max_bytes:
+            return
+
+        tmp_entry = self.directory / f".{key}.{os.getpid()}.tmp"
+        tmp_entry.mkdir(parents=True, exist_ok=True)
+        for name, array in zip(names, arrays):
+            np.save(tmp_entry / f"{name}.npy", np.ascontiguousarray(array))
+        with open(tmp_entry / "meta.json", "w") as file:
+            json.dump(
+                {
+                    "arrays": names,
+                    "bytes": size,
+                    "created": time.time(),
+                    "description": _json_safe(description),
+                },
+                file,
+            )
+
+        # Another process may have stored the same key in the meantime
+        try:
+            os.replace(tmp_entry, entry)
+        except OSError:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        self.evict()
+
+    def entries(self):
+        """(last access, bytes, path) of every complete entry"""
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        for entry in self.directory.iterdir():
+            meta_path = entry / "meta.json"
+            if entry.name.startswith(".") or not meta_path.is_file():
+                continue
+            with open(meta_path) as file:
+                size = json.load(file)["bytes"]
+            entries.append((meta_path.stat().st_mtime, size, entry))
+        return sorted(entries)
+
+    def evict(self):
+        """Drop least recently used entries until the store fits max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def simulate(self, model, T, observation_times=None, n_paths=None, return_brownian=False):
+        """model.simulate, served from the store when these paths were seen"""
+        description = self.describe(model, T, observation_times, n_paths, return_brownian)
+
+        arrays = self.load(description)
+        if arrays is not None:
+            return arrays
+
+        arrays = model.simulate_paths(T, observation_times, n_paths, return_brownian)
+        self.save(description, arrays)
+        return self.load(description) or arrays
+
+
+def _json_safe(description):
+    """JSON-safe copy of a description, kept in meta.json for inspection"""
+    return json.loads(
+        json.dumps(
+            description,
+            default=lambda value: value.tolist() if isinstance(value, np.ndarray) else str(value),
+        )
+    )
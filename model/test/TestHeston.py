@@ -1,5 +1,7 @@
 from model.Heston import HestonModel
+from helpers.fx_options import implied_volatility
 import numpy as np
+import time
 import seaborn as sns
 import matplotlib.pyplot as plt
 
@@ -18,6 +20,26 @@ class TestHestonModel:
         n_test_paths = 5
         self.t, self.S_paths, self.vol_paths = self.model.simulate(self.year)
 
+    def testOptionPricing(self):
+        """Cross-check the Monte Carlo pricer against the semi-analytic one"""
+        quotes = [
+            ("ATM 1Y", self.market_data["F_1y"], 1.0, "call"),
+            ("25D Call 1Y", self.market_data["K_call_1y"], 1.0, "call"),
+            ("25D Put 1Y", self.market_data["K_put_1y"], 1.0, "put"),
+            ("ATM 5Y", self.market_data["F_5y"], 5.0, "call"),
+            ("25D Call 5Y", self.market_data["K_call_5y"], 5.0, "call"),
+            ("25D Put 5Y", self.market_data["K_put_5y"], 5.0, "put"),
+        ]
+        for name, K, T, option_type in quotes:
+            mc_price = self.model.calculate_option_price(K, T, option_type)
+            analytic_price = self.model.calculate_option_price_analytic(
+                K, T, option_type
+            )
+            print(
+                f"{name}: MC {mc_price:.6f} Analytic {analytic_price:.6f} "
+                f"Diff {mc_price - analytic_price:+.6f}"
+            )
+
     def visualiseSpotPaths(self):
         for index in range(min(5, self.S_paths.shape[1])):
             fig = sns.lineplot(
@@ -63,3 +85,49 @@ class TestHestonModel:
         fig.grid(True, alpha=0.3)
         plt.show()
 
+    def visualiseVolatilitySmile(
+        self, maturities=(0.25, 1.0, 2.0, 5.0), n_strikes=100, n_maturities=100
+    ):
+        """
+        Implied volatility smile of the calibrated model: semi-analytic prices
+        on a strike x maturity grid, inverted in one vectorised call
+        """
+        T = np.linspace(0.1, 5.0, n_maturities)
+        F = self.model.S0 * np.exp(self.model.mu * T)
+        log_moneyness = np.linspace(-0.3, 0.3, n_strikes)[:, None] * np.sqrt(T)
+        K = F * np.exp(log_moneyness)
+        option_type = np.where(log_moneyness >= 0, "call", "put")
+        prices = self.model.calculate_option_price_analytic(K, T, option_type)
+
+        # Heston forwards grow at mu and are discounted at rd
+        start = time.perf_counter()
+        implied_vols = implied_volatility(
+            prices,
+            self.model.S0,
+            K,
+            T,
+            self.model.rd,
+            self.model.rd - self.model.mu,
+            option_type,
+        )
+        print(
+            f"Inverted {implied_vols.size} Heston prices in "
+            f"{1e3 * (time.perf_counter() - start):.1f} ms"
+        )
+
+        for maturity in maturities:
+            column = np.argmin(np.abs(T - maturity))
+            fig = sns.lineplot(
+                x=K[:, column] / F[column],
+                y=implied_vols[:, column],
+                label=f"T = {T[column]:.2f}",
+            )
+        fig.set_title("Heston Implied Volatility Smile")
+        fig.set_xlabel("Strike / Forward")
+        fig.set_ylabel("Implied Volatility")
+        fig.legend()
+        plt.grid(True, alpha=0.3)
+        plt.savefig("Figures/TrialVolSmile.svg")
+        plt.show()
+
+        return T, K, implied_vols
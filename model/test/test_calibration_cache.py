@@ -0,0 +1,74 @@
+from model.CalibrationCache import CalibrationCache
+
+BOUNDS = ((1e-4, 0.25), (1e-4, 0.25), (0.1, 5.0), (0.1, 1.0), (-0.9, 0.0))
+MARKET_DATA = {"F_1y": 1.18, "price_atm_1y_mkt": 0.031, "price_atm_5y_mkt": 0.072}
+INITIAL_PARAMS = {"v0": 0.0064, "theta": 0.0081, "kappa": 1.5, "sigma": 0.3, "rho": -0.3}
+
+
+class FakeModel:
+    """Records the warm start it was given instead of calibrating"""
+
+    calibration_bounds = BOUNDS
+
+    def __init__(self, feller=True):
+        self.feller = feller
+        self.initial_guess = "not called"
+
+    def pricer_settings(self, pricer="analytic"):
+        return {"pricer": pricer}
+
+    def set_parameters(self, params):
+        self.params = params
+
+    def calibrate(self, market_data, pricer="analytic", initial_guess=None):
+        self.initial_guess = initial_guess
+        return {
+            "params": {"v0": market_data["price_atm_1y_mkt"]},
+            "objective": 0.0,
+            "iterations": 1,
+            "success": True,
+            "feller": self.feller,
+        }
+
+
+def key(market_data):
+    return CalibrationCache.fingerprint(market_data, INITIAL_PARAMS, BOUNDS, {"pricer": "analytic"})
+
+
+def test_fingerprint_follows_every_input():
+    base = key(MARKET_DATA)
+    assert key(dict(MARKET_DATA)) == base
+    assert key({**MARKET_DATA, "price_atm_1y_mkt": 0.0310001}) != base
+    assert CalibrationCache.fingerprint(MARKET_DATA, INITIAL_PARAMS, BOUNDS, {"pricer": "mc"}) != base
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = CalibrationCache(tmp_path / "cache.pkl", max_entries=2)
+    cache.put("a", {"params": 1})
+    cache.put("b", {"params": 2})
+    assert cache.get("a") == {"params": 1}
+
+    cache.put("c", {"params": 3})
+    assert list(cache.entries) == ["a", "c"]
+
+    # Reloaded from disk in the same order
+    assert list(CalibrationCache(tmp_path / "cache.pkl", max_entries=2).entries) == ["a", "c"]
+
+
+def test_miss_warm_starts_from_nearest_feller_entry(tmp_path):
+    cache = CalibrationCache(tmp_path / "cache.pkl")
+    for price, feller in ((0.030, True), (0.040, True), (0.0315, False)):
+        cache.calibrate(FakeModel(feller), {**MARKET_DATA, "price_atm_1y_mkt": price}, INITIAL_PARAMS)
+    assert len(cache.entries) == 3
+
+    # 0.0315 is closest but fails Feller, so 0.030 seeds the calibration
+    model = FakeModel()
+    entry = cache.calibrate(model, {**MARKET_DATA, "price_atm_1y_mkt": 0.032}, INITIAL_PARAMS)
+    assert model.initial_guess == {"v0": 0.030}
+    assert entry["warm_start"]
+
+    # A hit returns the cached entry without calibrating
+    model = FakeModel()
+    entry = cache.calibrate(model, {**MARKET_DATA, "price_atm_1y_mkt": 0.0315}, INITIAL_PARAMS)
+    assert model.initial_guess == "not called"
+    assert not entry["feller"] and model.params == {"v0": 0.0315}
@@ -0,0 +1,106 @@
+import copy
+import warnings
+import numpy as np
+import pytest
+from model.Heston import HestonModel, worker_pool
+
+PARAMS = {
+    "S0": 1.16,
+    "v0": 0.0064,
+    "theta": 0.0081,
+    "kappa": 1.5,
+    "sigma": 0.3,
+    "rho": -0.3,
+    "mu": 0.0,
+    "usd_ir": 0.035,
+    "eur_ir": 0.0215,
+}
+
+
+def make_model(**options):
+    return HestonModel(S0=PARAMS["S0"], params=dict(PARAMS), **options)
+
+
+def test_sobol_scrambles_are_powers_of_two():
+    with pytest.warns(UserWarning, match="10000 paths rounded to 8192"):
+        model = make_model(n_paths=10000, sampler="sobol")
+
+    assert model.n_paths == 8192
+    assert model.chunk_sizes() == [512] * 16
+    with pytest.raises(ValueError):
+        model.chunk_sizes(10000)
+
+    # scipy warns when a Sobol draw is not a power of 2
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        _, spot, _ = model.simulate(1.0, observation_times=[0.5, 1.0])
+    assert spot.shape == (2, 8192)
+
+
+def test_results_do_not_depend_on_n_workers():
+    observation_times = [0.5, 1.0]
+    _, expected, _ = make_model(n_paths=60000, dt=0.25).simulate(1.0, observation_times)
+
+    for n_workers in (2, 4):
+        model = make_model(n_paths=60000, n_workers=n_workers, dt=0.25)
+        assert model.chunk_sizes() == [20000] * 3
+        _, spot, _ = model.simulate(1.0, observation_times)
+        assert np.array_equal(spot, expected)
+
+        # Later simulations, copies included, reuse the running pool
+        pool = worker_pool(n_workers)
+        _, again, _ = copy.copy(model).simulate(1.0, observation_times)
+        assert worker_pool(n_workers) is pool
+        assert np.array_equal(again, expected)
+
+
+def test_observation_times_are_grid_nodes():
+    model = make_model(n_paths=1000, dt=0.25)
+    observation_times = [0.1, 0.55, 1.0]
+
+    t, dt, observation_index = model.time_grid(1.0, observation_times)
+    assert np.allclose(t[observation_index], observation_times, rtol=0, atol=1e-15)
+    assert np.allclose(np.cumsum(dt)[observation_index - 1], observation_times)
+    assert dt.max() <= 0.25
+
+    kept, jobs = model.simulation_jobs(1.0, observation_times)
+    assert np.array_equal(kept, observation_times)
+    assert jobs[0][0] == len(dt)
+
+
+def test_weak_error_decreases_with_step_size():
+    # Strong vol of vol and correlation, so the discretisation bias is well
+    # above the Monte Carlo error at 200k paths
+    params = dict(PARAMS, S0=1.0, v0=0.04, theta=0.04, kappa=1.0, sigma=0.6, rho=-0.7)
+    strikes = np.array([0.9, 1.0])
+
+    def weak_error(scheme, steps_per_year):
+        model = HestonModel(
+            S0=1.0, params=dict(params), n_paths=200000, dt=1 / steps_per_year, scheme=scheme
+        )
+        price, stderr = model.calculate_option_prices(
+            strikes, 1.0, return_stderr=True, control_variate=True
+        )
+        return np.abs(price - model.calculate_option_price_analytic(strikes, 1.0)), stderr
+
+    euler = [weak_error("euler", steps) for steps in (4, 16, 64)]
+    for (coarse, coarse_se), (fine, fine_se) in zip(euler[:-1], euler[1:]):
+        assert np.all(coarse - fine > 3 * np.hypot(coarse_se, fine_se))
+
+    # QE at quarterly steps beats Euler at weekly ones
+    qe, _ = weak_error("qe", 4)
+    assert np.all(qe < euler[-1][0])
+
+
+def test_analytic_prices_match_qe_monte_carlo():
+    # QE, not Euler: Euler at daily steps is biased by several percent ATM
+    model = make_model(n_paths=200000, scheme="qe", dt=1 / 52)
+    K = np.array([1.0, 1.16, 1.35])[:, None]
+    T = np.array([1.0, 5.0])
+    option_type = np.array(["put", "call", "call"])[:, None]
+
+    mc, stderr = model.calculate_option_prices(K, T, option_type, return_stderr=True)
+    analytic = model.calculate_option_price_analytic(K, T, option_type)
+
+    assert analytic.shape == (3, 2)
+    assert np.all(np.abs(mc - analytic) < 4 * stderr)
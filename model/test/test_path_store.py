@@ -0,0 +1,66 @@
+import numpy as np
+from model.PathStore import PathStore
+from model.test.test_heston import make_model
+
+T, TIMES = 1.0, [0.5, 1.0]
+
+
+def stored_model(directory, max_bytes=2**30, **options):
+    return make_model(n_paths=2000, dt=0.25, path_store=PathStore(directory, max_bytes), **options)
+
+
+def test_stored_paths_reopen_memory_mapped(tmp_path, monkeypatch):
+    model = stored_model(tmp_path)
+    expected = model.simulate_paths(T, TIMES)
+
+    first = model.simulate(T, TIMES)
+    assert [entry.name.startswith(".") for entry in tmp_path.iterdir()] == [False]
+
+    # A hit reads the files back without simulating
+    def no_simulation(*args):
+        raise AssertionError("simulated on a store hit")
+
+    monkeypatch.setattr(model, "simulate_paths", no_simulation)
+    for arrays in (first, model.simulate(T, TIMES)):
+        for array, original in zip(arrays, expected):
+            assert isinstance(array, np.memmap) and not array.flags.writeable
+            assert np.array_equal(array, original)
+
+
+def test_changed_parameters_miss(tmp_path):
+    model = stored_model(tmp_path)
+    _, spot, _ = model.simulate(T, TIMES)
+
+    model.sigma = 0.31
+    _, bumped, _ = model.simulate(T, TIMES)
+    assert len(model.path_store.entries()) == 2
+    assert not np.array_equal(spot, bumped)
+
+
+def test_half_written_entry_is_a_miss(tmp_path):
+    model = stored_model(tmp_path)
+    model.simulate(T, TIMES)
+    (_, _, entry), = model.path_store.entries()
+    (entry / "meta.json").unlink()
+
+    description = PathStore.describe(model, T, TIMES)
+    assert model.path_store.load(description) is None
+    assert not entry.exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    model = stored_model(tmp_path)
+    model.simulate(T, TIMES)
+    (_, entry_bytes, oldest), = model.path_store.entries()
+
+    # Room for two entries: the third evicts the least recently used
+    store = PathStore(tmp_path, max_bytes=int(2.5 * entry_bytes))
+    model.path_store = store
+    for seed in (1, 2):
+        model.random_seed = seed
+        model.simulate(T, TIMES)
+        (_, _, newest) = store.entries()[-1]
+
+    kept = [entry for _, _, entry in store.entries()]
+    assert len(kept) == 2 and oldest not in kept and newest in kept
+    assert sum(size for _, size, _ in store.entries()) <= store.max_bytes
@@ -5,11 +5,11 @@ import numpy as np
 
 def plotIRRDistributions(results):
 
-    for index, result in results.iterrows():
-        irrs = result["IRR"]
-        if len(result["IRR"]) > 2000:
-            irrs = np.random.choice(result["IRR"], 2000, replace=False)
-        fig = sns.histplot(irrs, label=result["Strategy Name"], bins=50, kde=True)
+    for row, name in enumerate(results.names):
+        irrs = results.valid_irr(row)
+        if len(irrs) > 2000:
+            irrs = np.random.choice(irrs, 2000, replace=False)
+        fig = sns.histplot(irrs, label=name, bins=50, kde=True)
     fig.set_xlabel("IRR")
     fig.set_ylabel("Density")
     fig.set_title("IRR Distributions")
@@ -20,13 +20,15 @@ def plotIRRDistributions(results):
 
 
 def plotMeanRiskScatter(results):
-    for index, result in results.iterrows():
+    for name, irr_std, mean_irr in zip(
+        results.names, results.irr_std(), results.mean_irr()
+    ):
         fig = sns.scatterplot(
-            x=[result["IRR"].std()],
-            y=[result["IRR"].mean()],
+            x=[irr_std],
+            y=[mean_irr],
             s=800,
             # marker='x',
-            label=result["Strategy Name"],
+            label=name,
         )
 
     fig.set_xlabel("IRR Standard Deviation (Risk)")
@@ -38,10 +40,8 @@ def plotMeanRiskScatter(results):
 
 
 def plotMultipleDistributions(results):
-    for index, result in results.iterrows():
-        fig = sns.histplot(
-            result["Multiples"], label=result["Strategy Name"], kde=False
-        )
+    for name, multiples in zip(results.names, results.multiples):
+        fig = sns.histplot(multiples, label=name, kde=False)
     fig.set_xlabel("Multiple on Invested Capital")
     fig.set_ylabel("Density")
     fig.set_xlim((0, 5))
@@ -54,7 +54,7 @@ def plotMultipleDistributions(results):
 
 def plotVaR(results):
 
-    fig = sns.barplot(y=results["VaR"],x=results['Strategy Name'])
+    fig = sns.barplot(y=results.summary["VaR"], x=results.summary["Strategy Name"])
 
     fig.set_xlabel("Strategy Name")
     fig.set_ylabel("VaR")
@@ -65,7 +65,7 @@ def plotVaR(results):
 
 def plotCVaR(results):
 
-    fig = sns.barplot(y=results["CVaR"],x=results['Strategy Name'])
+    fig = sns.barplot(y=results.summary["CVaR"], x=results.summary["Strategy Name"])
 
     fig.set_xlabel("Strategy Name")
     fig.set_ylabel("CVaR")
@@ -76,23 +76,23 @@ def plotCVaR(results):
     plt.show()
 
 
-def plotBestWorstIRRScenario(results):
+def plotBestWorstIRRScenario(scenarios):
 
     fig, axes = plt.subplots(2, 1, sharex=True)
 
-    for index, result in results.iterrows():
-        irrs = result["worst_IRR"]
-        fig = sns.histplot(irrs, label=result["Strategy Name"], bins=10, kde=False,ax=axes[0])
+    for scenario in scenarios:
+        irrs = scenario["worst_IRR"]
+        fig = sns.histplot(irrs, label=scenario["Strategy Name"], bins=10, kde=False,ax=axes[0])
     fig.set_title("Worst Case IRR Distribution")
     fig.set_ylabel("Density")
     fig.legend()
     fig.grid(True, alpha=0.3)
 
-    for index, result in results.iterrows():
-        irrs = result["best_IRR"]
+    for scenario in scenarios:
+        irrs = scenario["best_IRR"]
         if len(irrs) > 3000:
-            irrs = np.random.choice(result["best_IRR"], 3000, replace=False)
-        fig = sns.histplot(irrs, label=result["Strategy Name"], bins=10, kde=False,ax=axes[1])
+            irrs = np.random.choice(scenario["best_IRR"], 3000, replace=False)
+        fig = sns.histplot(irrs, label=scenario["Strategy Name"], bins=10, kde=False,ax=axes[1])
     
     fig.set_xlabel("IRR")
     fig.set_title("Best Case IRR Distribution")
@@ -103,21 +103,21 @@ def plotBestWorstIRRScenario(results):
     plt.show()
 
 
-def plotBestWorstCaseMultiples(results):
+def plotBestWorstCaseMultiples(scenarios):
 
     fig, axes = plt.subplots(2, 1, sharex=True)
 
-    for index, result in results.iterrows():
-        multiple = result["worst_Multiple"]
-        fig = sns.histplot(multiple, label=result["Strategy Name"], bins=50, kde=True,ax=axes[0])
+    for scenario in scenarios:
+        multiple = scenario["worst_Multiple"]
+        fig = sns.histplot(multiple, label=scenario["Strategy Name"], bins=50, kde=True,ax=axes[0])
     fig.set_title("Worst Case Multiple Distribution")
     fig.set_ylabel("Density")
     fig.legend()
     fig.grid(True, alpha=0.3)
 
-    for index, result in results.iterrows():
-        multiple = result["best_Multiple"]
-        fig = sns.histplot(multiple, label=result["Strategy Name"], bins=50, kde=True,ax=axes[1])
+    for scenario in scenarios:
+        multiple = scenario["best_Multiple"]
+        fig = sns.histplot(multiple, label=scenario["Strategy Name"], bins=50, kde=True,ax=axes[1])
     
     fig.set_xlabel("Multiple")
     fig.set_title("Best Case Multiple Distribution")
@@ -135,7 +135,7 @@ def plotComparisons(results):
     plotVaR(results)
     plotCVaR(results)
 
-def plotExtremes(results):
-    plotBestWorstIRRScenario(results)
-    plotBestWorstCaseMultiples(results)
+def plotExtremes(scenarios):
+    plotBestWorstIRRScenario(scenarios)
+    plotBestWorstCaseMultiples(scenarios)
 
@@ -0,0 +1,234 @@
+import json
+import os
+import shutil
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from portfolio.case_study import (
+    cash_flows_eur,
+    getForwardRates,
+    getInitialParameters,
+    getKeyDates,
+    getMarketData,
+    simulateTrainingPaths,
+)
+from model.Heston import HestonModel
+from portfolio.BatchRunner import evaluate_schedule
+
+# Rows of history needed before the first backtest date, so the 1M realised
+# vol autocorrelation behind the initial kappa is defined
+MIN_HISTORY = 63
+
+
+def backtest_rows(dataset, start="2020-01-01", end=None, every=1):
+    """Row index of every backtest date: each `every`-th row from start to end"""
+    dates = pd.to_datetime(dataset["Date"])
+    selected = (dates >= pd.Timestamp(start)) & (dataset.index >= MIN_HISTORY)
+    if end is not None:
+        selected &= dates <= pd.Timestamp(end)
+    return list(dataset.index[selected][::every])
+
+
+class BacktestCheckpoint:
+    """
+    One JSON file per completed date, written atomically, so an interrupted
+    backtest resumes from the dates already done. options.json records the
+    settings the results belong to; resuming with other settings is refused.
+    """
+
+    def __init__(self, directory, options):
+        self.directory = Path(directory)
+        self.options = options
+
+    def open(self, restart=False):
+        if restart:
+            shutil.rmtree(self.directory, ignore_errors=True)
+        (self.directory / "dates").mkdir(parents=True, exist_ok=True)
+
+        options_path = self.directory / "options.json"
+        if options_path.is_file():
+            with open(options_path) as file:
+                saved = json.load(file)
+            if saved != self.options:
+                raise ValueError(
+                    f"Checkpoints in {self.directory} were run with {saved}; "
+                    "restart or use another checkpoint directory"
+                )
+        else:
+            with open(options_path, "w") as file:
+                json.dump(self.options, file, indent=2)
+        return self
+
+    def path(self, date):
+        return self.directory / "dates" / f"{date}.json"
+
+    def load(self, date):
+        try:
+            with open(self.path(date)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, date, record):
+        tmp_path = self.path(date).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(record, file, default=float)
+        os.replace(tmp_path, self.path(date))
+
+    def done(self):
+        return {path.stem for path in (self.directory / "dates").glob("*.json")}
+
+
+def backtest_date(history, initial_guess, options):
+    """
+    Calibrate, simulate and evaluate every strategy as of the last row of
+    history, using only the rows up to it. initial_guess (the previous
+    date's calibrated params) warm-starts the calibration.
+    """
+    date = str(history["Date"].iloc[-1])
+    initial_params = getInitialParameters(history)
+    market_data = getMarketData(history, initial_params)
+
+    model = HestonModel(
+        S0=initial_params["S0"],
+        params=dict(initial_params),
+        n_paths=options["n_paths"],
+        antithetic=options["antithetic"],
+        sampler=options["sampler"],
+    )
+    calibration = model.calibrate(market_data, initial_guess=initial_guess)
+
+    # The case-study schedule, shifted to start the same time after this date
+    _, times_to_cf = getKeyDates()
+    _, spot_at_cf_dates, _ = model.simulate(max(times_to_cf), observation_times=times_to_cf)
+    training_spot = simulateTrainingPaths(model, times_to_cf)
+    forward_rates = getForwardRates(initial_params)
+
+    rows = evaluate_schedule(
+        date,
+        cash_flows_eur,
+        spot_at_cf_dates,
+        training_spot,
+        forward_rates,
+        times_to_cf,
+        options["confidence"],
+    )
+    return {
+        "Date": date,
+        "S0": initial_params["S0"],
+        "warm_start": initial_guess is not None,
+        **calibration,
+        "rows": rows,
+    }
+
+
+def run_block(dataset, rows, checkpoint, options):
+    """
+    Backtest consecutive dates in order. The first calibration of the block
+    starts from the initial parameters and each later one warm-starts from
+    the date before, read back from its checkpoint when resuming, so results
+    do not depend on the number of workers or on interruptions.
+    """
+    initial_guess = None
+    completed = []
+    for row in rows:
+        date = str(dataset["Date"].iloc[row])
+        record = checkpoint.load(date)
+        if record is None:
+            record = backtest_date(dataset.iloc[: row + 1], initial_guess, options)
+            checkpoint.save(date, record)
+        if record["success"]:
+            initial_guess = record["params"]
+        completed.append(date)
+    return completed
+
+
+def run_backtest(
+    dataset,
+    start="2020-01-01",
+    end=None,
+    every=1,
+    n_workers=1,
+    block_size=21,
+    checkpoint_dir="reports/backtest",
+    restart=False,
+    n_paths=10000,
+    antithetic=False,
+    sampler="pseudo",
+    confidence=0.95,
+):
+    """
+    Run the case study as of every backtest date and return one table with a
+    row per date and strategy.
+
+    Dates are split into blocks of block_size consecutive dates, spread over
+    n_workers processes; within a block each calibration warm-starts from
+    the previous date (see run_block). Every date is checkpointed, so
+    rerunning after an interruption only does the dates that are missing.
+    The block size decides where the warm-start chains restart, so it is
+    part of the recorded options.
+    """
+    options = {
+        "start": start,
+        "end": end,
+        "every": every,
+        "block_size": block_size,
+        "n_paths": n_paths,
+        "antithetic": antithetic,
+        "sampler": sampler,
+        "confidence": confidence,
+    }
+    checkpoint = BacktestCheckpoint(checkpoint_dir, options).open(restart)
+
+    rows = backtest_rows(dataset, start, end, every)
+    done = checkpoint.done()
+    pending = [row for row in rows if str(dataset["Date"].iloc[row]) not in done]
+    print(
+        f"Backtesting {len(pending)} of {len(rows)} dates "
+        f"({len(rows) - len(pending)} checkpointed)"
+    )
+
+    # Blocks keep their position in the full date list, so block starts (and
+    # so warm starts) do not depend on what was already done
+    blocks = [rows[first : first + block_size] for first in range(0, len(rows), block_size)]
+    blocks = [block for block in blocks if any(row in pending for row in block)]
+
+    if n_workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(run_block, dataset, block, checkpoint, options) for block in blocks
+            ]
+            for future in as_completed(futures):
+                completed = future.result()
+                print(f"Backtested {completed[0]} to {completed[-1]}")
+    else:
+        for block in blocks:
+            completed = run_block(dataset, block, checkpoint, options)
+            print(f"Backtested {completed[0]} to {completed[-1]}")
+
+    return collect_backtest(checkpoint, [str(dataset["Date"].iloc[row]) for row in rows])
+
+
+def collect_backtest(checkpoint, dates):
+    """One row per date and strategy, with the calibration alongside"""
+    calibrated_names = ("v0", "theta", "kappa", "sigma", "rho")
+    records = []
+    for date in dates:
+        record = checkpoint.load(date)
+        if record is None:
+            continue
+        for row in record["rows"]:
+            row = dict(row)
+            row.pop("Fund")
+            records.append(
+                {
+                    "Date": date,
+                    "S0": record["S0"],
+                    **row,
+                    **{f"Calibrated {name}": record["params"][name] for name in calibrated_names},
+                    "Calibration Objective": record["objective"],
+                    "Calibration Success": record["success"],
+                    "Warm Start": record["warm_start"],
+                }
+            )
+    return pd.DataFrame(records)
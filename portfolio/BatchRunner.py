@@ -0,0 +1,119 @@
+import json
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from portfolio.case_study import (
+    buildStrategies,
+    getForwardRates,
+    getKeyDates,
+    simulateTrainingPaths,
+)
+from metrics.CostBenefitAnalysis import calculate_cost_benefit_analysis
+from metrics.Results import StrategyResults
+
+
+def load_schedules(path):
+    """
+    EUR cash-flow schedules by fund, each a {"YYYY-MM-DD": amount} dict in
+    date order like case_study.cash_flows_eur.
+
+    CSV files are long format with Fund, Date and Amount columns; JSON files
+    map each fund to its schedule.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path) as file:
+            schedules = json.load(file)
+    else:
+        frame = pd.read_csv(path, dtype={"Fund": str, "Date": str})
+        schedules = {
+            fund: dict(zip(rows["Date"], rows["Amount"].astype(float)))
+            for fund, rows in frame.groupby("Fund", sort=False)
+        }
+
+    return {
+        fund: {date: float(schedule[date]) for date in sorted(schedule)}
+        for fund, schedule in schedules.items()
+    }
+
+
+def schedule_dates(schedules):
+    """Union of every schedule's cash-flow dates, in date order"""
+    return sorted({date for schedule in schedules.values() for date in schedule})
+
+
+def evaluate_schedule(
+    fund, cash_flows, spot_at_cf_dates, training_spot, forward_rates, times_to_cf, confidence=0.95
+):
+    """
+    Every strategy on one schedule. The IRRs of all strategies are solved in
+    a single vectorised call, and the cost-benefit metrics are taken against
+    the schedule's unhedged run. The optimised hedge is fitted on
+    training_spot, independent paths at the same dates.
+    """
+    strategy_cfs = buildStrategies(
+        cash_flows, spot_at_cf_dates, forward_rates, times_to_cf, training_spot
+    )
+    results = StrategyResults.from_cash_flows(strategy_cfs, times_to_cf, confidence=confidence)
+
+    table = results.summary[
+        [
+            "Strategy Name",
+            "Mean IRR",
+            "IRR Std",
+            "VaR",
+            "CVaR",
+            "Mean Multiple",
+            "Not Converged",
+        ]
+    ]
+    table = pd.concat(
+        [table, calculate_cost_benefit_analysis(results).drop(columns="Strategy Name")],
+        axis=1,
+    )
+    table.insert(0, "Fund", fund)
+
+    return table.to_dict("records")
+
+
+def run_batch(model, schedules, initial_params, n_workers=1, confidence=0.95):
+    """
+    Simulate once to the longest horizon, observing spot at the union of all
+    cash-flow dates, then evaluate every strategy x schedule combination on
+    those shared paths. Schedules are spread over n_workers processes.
+    Returns one consolidated results table.
+    """
+    union = {date: 0.0 for date in schedule_dates(schedules)}
+    union_dates, union_times = getKeyDates(union)
+    _, spot, _ = model.simulate(max(union_times), observation_times=union_times)
+    training_spot = simulateTrainingPaths(model, union_times)
+    rows_by_date = {date: row for row, date in enumerate(union)}
+    union_forwards = list(getForwardRates(initial_params, union).values())
+
+    jobs = []
+    for fund, cash_flows in schedules.items():
+        rows = [rows_by_date[date] for date in cash_flows]
+        _, times_to_cf = getKeyDates(cash_flows)
+        forward_rates = {union_dates[row]: union_forwards[row] for row in rows}
+        jobs.append(
+            (
+                fund,
+                cash_flows,
+                spot[rows],
+                training_spot[rows],
+                forward_rates,
+                np.asarray(times_to_cf),
+                confidence,
+            )
+        )
+
+    print(f"Evaluating {len(jobs)} schedules on {spot.shape[1]} shared paths")
+
+    if n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(evaluate_schedule, *zip(*jobs)))
+    else:
+        results = [evaluate_schedule(*job) for job in jobs]
+
+    return pd.DataFrame([row for rows in results for row in rows])
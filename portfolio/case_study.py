@@ -0,0 +1,160 @@
+"""
+The case study's inputs and strategy set, shared by main.py, batch.py,
+backtest.py and the portfolio runners: the fund's EUR cash flows, the
+dataset and initial Heston parameters, the key dates and forwards, the
+25-delta market quotes and the hedging strategies evaluated on the paths.
+"""
+
+import copy
+from datetime import datetime
+import numpy as np
+
+cash_flows_eur = {
+    "2025-10-01": -10000000,  # Initial investment (outflow)
+    "2026-10-01": 1000000,  # Year 1
+    "2027-10-01": 1000000,  # Year 2
+    "2029-10-01": 1000000,  # Year 3
+    "2030-10-01": 11000000,  # Year 4
+}
+
+
+def getDataset(workbook=None):
+    from data.features import update_features
+
+    if workbook is not None:
+        from data.xls_converter import convert
+
+        convert(workbook, "data/market_data.csv")
+    return update_features()
+
+
+def getInitialParameters(dataset):
+    latest_data = dataset.iloc[-1]
+
+    """ Calculate Current Data """
+    mu = dataset["EURUSD_Spot_LOG_RETURNS"].mean() * 252
+    v0 = (latest_data["EURUSD_1Y_ATM_VOL_MID"]) ** 2
+    theta = (latest_data["EURUSD_5Y_ATM_VOL_MID"]) ** 2
+
+    realised_vol = dataset["EURUSD_1M_REALISED_VOL"].dropna()
+    kappa = 1.5
+    if len(realised_vol) > 1:
+        autocorr = realised_vol.autocorr(lag=1)
+        kappa = -np.log(autocorr) * 252 if autocorr > 0 else 1.5
+
+    implied_vol = (
+        dataset["EURUSD_1Y_ATM_VOL_MID"].pct_change().std() * np.sqrt(252)
+    ) / 100
+    sigma = implied_vol if not np.isnan(implied_vol) else 0.3
+    rho = -0.4
+
+    initial_params = {
+        "S0": latest_data["EURUSD_Spot_MID"],
+        "v0": v0,
+        "theta": theta,
+        "kappa": kappa,
+        "sigma": sigma,
+        "rho": rho,
+        "mu": mu,
+        "usd_ir": 0.035,
+        "eur_ir": 0.0215,
+    }
+
+    return initial_params
+
+
+def getKeyDates(cash_flows=None):
+    cash_flows = cash_flows or cash_flows_eur
+    last_date = datetime(2025, 8, 1)  # last date in the dataset
+    cash_flow_dates = [
+        datetime.strptime(date, "%Y-%m-%d") for date in cash_flows.keys()
+    ]
+    times_to_cf = [(date - last_date).days / 365.25 for date in cash_flow_dates]
+
+    return cash_flow_dates, times_to_cf
+
+
+def getForwardRates(initial_params, cash_flows=None):
+    forward_rates = {}
+    cash_flow_dates, times_to_cf = getKeyDates(cash_flows)
+    for date, T in zip(cash_flow_dates, times_to_cf):
+        forward_rate = initial_params["S0"] * np.exp(
+            (initial_params["usd_ir"] - initial_params["eur_ir"]) * T
+        )
+        forward_rates[date] = forward_rate
+    return forward_rates
+
+
+def getMarketData(dataset, initial_params):
+    from helpers.black_scholes_prices import getBlackScholesOptions
+
+    F_1y, K_call_1y, K_put_1y, price_atm_1y_mkt, price_call_1y_mkt, price_put_1y_mkt = (
+        getBlackScholesOptions(dataset, initial_params, 1)
+    )
+    F_5y, K_call_5y, K_put_5y, price_atm_5y_mkt, price_call_5y_mkt, price_put_5y_mkt = (
+        getBlackScholesOptions(dataset, initial_params, 5)
+    )
+
+    market_data = {
+        "F_1y": F_1y,
+        "K_call_1y": K_call_1y,
+        "K_put_1y": K_put_1y,
+        "F_5y": F_5y,
+        "K_call_5y": K_call_5y,
+        "K_put_5y": K_put_5y,
+        "price_atm_1y_mkt": price_atm_1y_mkt,
+        "price_call_1y_mkt": price_call_1y_mkt,
+        "price_put_1y_mkt": price_put_1y_mkt,
+        "price_atm_5y_mkt": price_atm_5y_mkt,
+        "price_call_5y_mkt": price_call_5y_mkt,
+        "price_put_5y_mkt": price_put_5y_mkt,
+    }
+
+    return market_data
+
+
+def simulateTrainingPaths(model, times_to_cf):
+    """
+    Spot at the cash-flow dates on paths independent of model.simulate's
+    (the next random seed), for fitting strategies out of sample
+    """
+    training_model = copy.copy(model)
+    training_model.random_seed = model.random_seed + 1
+    _, spot_at_cf_dates, _ = training_model.simulate(
+        max(times_to_cf), observation_times=times_to_cf
+    )
+    return spot_at_cf_dates
+
+
+def getStrategies(cash_flows, forward_rates, times_to_cf, training_spot):
+    """
+    The hedging strategies of the case study. The optimised hedge is fitted
+    on training_spot, independent paths from simulateTrainingPaths, so its
+    reported metrics are out of sample.
+    """
+    from strategies.StaticForward import StaticForwardHedging
+    from strategies.BatchedHedge import BatchedForwardHedging
+    from strategies.DynamicDelta import DynamicDeltaHedging
+    from strategies.NoHedging import NoHedging
+    from strategies.OptimisedHedge import OptimisedForwardHedging
+
+    optimisedHedging = OptimisedForwardHedging(
+        cash_flows, objective="risk_adjusted", risk_aversion=0.5
+    )
+    optimisedHedging.optimise(training_spot, forward_rates, times_to_cf)
+
+    return [
+        NoHedging(cash_flows),
+        StaticForwardHedging(cash_flows),
+        BatchedForwardHedging(cash_flows, [0.5, 0.8]),
+        DynamicDeltaHedging(cash_flows),
+        optimisedHedging,
+    ]
+
+
+def buildStrategies(cash_flows, spot_at_cf_dates, forward_rates, times_to_cf, training_spot):
+    """(name, USD cash flows) of every strategy of getStrategies on the simulated paths"""
+    from metrics.Streaming import strategy_cash_flows
+
+    strategies = getStrategies(cash_flows, forward_rates, times_to_cf, training_spot)
+    return list(strategy_cash_flows(strategies, spot_at_cf_dates, forward_rates))
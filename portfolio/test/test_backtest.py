@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+from data.features import derive_features
+from portfolio.Backtest import run_backtest
+
+
+def test_resume_with_other_block_size_is_refused(tmp_path):
+    dataset = derive_features(pd.read_csv("data/market_data.csv"))
+    # A start after the data leaves no dates, so nothing is calibrated
+    options = dict(start="2100-01-01", checkpoint_dir=tmp_path)
+
+    assert run_backtest(dataset, block_size=3, **options).empty
+    assert run_backtest(dataset, block_size=3, **options).empty
+    with pytest.raises(ValueError):
+        run_backtest(dataset, block_size=5, **options)
+
+
+def run_last_dates(checkpoint_dir, n_workers=1):
+    dataset = derive_features(pd.read_csv("data/market_data.csv"))
+    return run_backtest(
+        dataset,
+        start=dataset["Date"].iloc[-4],
+        block_size=2,
+        n_workers=n_workers,
+        n_paths=500,
+        checkpoint_dir=checkpoint_dir,
+    )
+
+
+def test_results_do_not_depend_on_workers_or_interruptions(tmp_path, capsys):
+    serial = run_last_dates(tmp_path / "serial")
+    assert serial["Date"].nunique() == 4
+    assert serial["Warm Start"].sum() == serial["Warm Start"].size // 2
+
+    parallel = run_last_dates(tmp_path / "parallel", n_workers=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+    # Drop the second date of the first block, which warm-starts from the
+    # first; resuming recomputes only that date from the saved first one
+    second = sorted((tmp_path / "serial" / "dates").glob("*.json"))[1]
+    second.unlink()
+    capsys.readouterr()
+    resumed = run_last_dates(tmp_path / "serial")
+    assert "Backtesting 1 of 4 dates" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(resumed, serial)
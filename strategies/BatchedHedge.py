@@ -0,0 +1,37 @@
+from strategies.Hedging import HedgingStrategy
+import numpy as np
+
+
+class BatchedForwardHedging(HedgingStrategy):
+    """
+    Many forward hedge programs evaluated against the same paths at once.
+
+    hedge_ratios is either one ratio per program, shape (n_strategies,), or a
+    per-date ratio matrix, shape (n_strategies, n_dates).
+    """
+
+    def __init__(self, cash_flows_eur, hedge_ratios, names=None):
+        super().__init__("Batched Forward Hedge")
+        self.cash_flows_eur = cash_flows_eur
+
+        hedge_ratios = np.asarray(hedge_ratios, dtype=float)
+        if hedge_ratios.ndim == 1:
+            default_names = [f"Partial Hedge {ratio:g}" for ratio in hedge_ratios]
+            hedge_ratios = np.repeat(
+                hedge_ratios[:, None], len(cash_flows_eur), axis=1
+            )
+        else:
+            default_names = [
+                f"Hedge Program {index}" for index in range(len(hedge_ratios))
+            ]
+
+        self.hedge_ratios = hedge_ratios
+        self.names = names if names is not None else default_names
+
+    def calculate_usd_cf(self, spot_at_cf_dates, forward_rates):
+        """USD cash flows of every program, shape (n_strategies, n_paths, n_dates)"""
+        unhedged = self.hedged_usd_cf(0.0, spot_at_cf_dates, forward_rates)
+        hedge_gain = self.hedged_usd_cf(1.0, spot_at_cf_dates, forward_rates) - unhedged
+
+        # One fused multiply-add over the program axis
+        return unhedged + self.hedge_ratios[:, None, :] * hedge_gain
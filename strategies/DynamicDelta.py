@@ -10,17 +10,8 @@ class DynamicDeltaHedging(HedgingStrategy):
     def calculate_usd_cf(self, spot_at_cf_dates, forward_rates, hedge_ratio=1.0):
 
         # Dynamically adjust hedge ratio based on spot movement
-        usd_cf = np.zeros((spot_at_cf_dates.shape[1], len(self.cash_flows_eur)))
+        forwards = np.array(list(forward_rates.values()), dtype=float)
+        moneyness = spot_at_cf_dates.T / forwards
+        dynamic_ratio = np.clip(1.0 - 0.3 * (moneyness - 1.0), 0.5, 1.5)
 
-        for index, (date, eur_cf) in enumerate(self.cash_flows_eur.items()):
-            current_spot = spot_at_cf_dates[index, :]
-            forward_rate = list(forward_rates.values())[index]
-
-            moneyness = current_spot / forward_rate
-            dynamic_ratio = np.clip(1.0 - 0.3 * (moneyness - 1.0), 0.5, 1.5)
-
-            usd_cf[:, index] = eur_cf * (
-                dynamic_ratio * forward_rate + (1 - dynamic_ratio) * current_spot
-            )
-
-        return usd_cf
+        return self.hedged_usd_cf(dynamic_ratio, spot_at_cf_dates, forward_rates)
@@ -1,7 +1,22 @@
+import numpy as np
+
+
 class HedgingStrategy:
     
     def __init__(self, name):
         self.name = name
 
     def calculate_usd_cf(self,spot_at_cf_dates, forward_rates, hedge_ratio):
-        return None
\ No newline at end of file
+        return None
+
+    def hedged_usd_cf(self, hedge_ratios, spot_at_cf_dates, forward_rates):
+        """
+        USD cash flows when hedge_ratios of each EUR cash flow is sold forward
+        and the rest converted at spot. hedge_ratios broadcasts against
+        (n_paths, n_dates), with extra leading axes for batches of programs.
+        """
+        eur_cfs = np.array(list(self.cash_flows_eur.values()), dtype=float)
+        forwards = np.array(list(forward_rates.values()), dtype=float)
+        spots = spot_at_cf_dates.T
+
+        return eur_cfs * (hedge_ratios * forwards + (1 - hedge_ratios) * spots)
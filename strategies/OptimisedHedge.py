@@ -0,0 +1,77 @@
+from strategies.Hedging import HedgingStrategy
+from metrics.IRR import solve_irr
+from metrics.VAR import calculate_var
+from scipy.optimize import minimize
+import numpy as np
+
+
+class OptimisedForwardHedging(HedgingStrategy):
+    """
+    Per-date forward hedge ratios chosen by optimisation over a fixed set of
+    simulated paths (common random numbers).
+
+    objective="cvar" minimises the CVaR of the IRR, objective="risk_adjusted"
+    maximises mean IRR - risk_aversion * CVaR. Gradients come from the
+    implicit function theorem on each path's NPV(IRR) = 0, so each optimiser
+    iteration is one vectorised IRR solve.
+    """
+
+    def __init__(
+        self, cash_flows_eur, objective="cvar", risk_aversion=1.0, bounds=(0.0, 1.0)
+    ):
+        super().__init__("Optimised Hedge")
+        self.cash_flows_eur = cash_flows_eur
+
+        if objective not in ("cvar", "risk_adjusted"):
+            raise ValueError(f"Unknown hedge objective: {objective}")
+        self.objective = objective
+        self.risk_aversion = risk_aversion
+        self.bounds = bounds
+
+        self.hedge_ratios = np.full(len(cash_flows_eur), 0.5)
+
+    def calculate_usd_cf(self, spot_at_cf_dates, forward_rates):
+        return self.hedged_usd_cf(self.hedge_ratios, spot_at_cf_dates, forward_rates)
+
+    def evaluate(self, hedge_ratios, unhedged, hedge_gain, times, confidence=0.95):
+        """Objective value and its gradient with respect to the hedge ratios"""
+        usd_cf = unhedged + hedge_ratios * hedge_gain
+        irr, converged = solve_irr(usd_cf, times)
+        irr = irr[converged]
+        usd_cf, hedge_gain = usd_cf[converged], hedge_gain[converged]
+
+        # dIRR/dh = -(dNPV/dh) / (dNPV/dIRR) per path
+        discount = (1 + irr[:, None]) ** -times
+        dnpv_dirr = -np.sum(times * usd_cf * discount, axis=1) / (1 + irr)
+        dirr = -(hedge_gain * discount) / dnpv_dirr[:, None]
+
+        var = calculate_var(irr, confidence)
+        tail = irr <= -var
+        cvar = -irr[tail].mean()
+        dcvar = -dirr[tail].mean(axis=0)
+
+        if self.objective == "cvar":
+            return cvar, dcvar
+
+        value = irr.mean() - self.risk_aversion * cvar
+        gradient = dirr.mean(axis=0) - self.risk_aversion * dcvar
+        return -value, -gradient
+
+    def optimise(self, spot_at_cf_dates, forward_rates, times_to_cf, confidence=0.95):
+        """Fit the per-date hedge ratios on the given paths"""
+        times = np.asarray(times_to_cf, dtype=float)
+        unhedged = self.hedged_usd_cf(0.0, spot_at_cf_dates, forward_rates)
+        hedged = self.hedged_usd_cf(1.0, spot_at_cf_dates, forward_rates)
+        hedge_gain = hedged - unhedged
+
+        result = minimize(
+            self.evaluate,
+            self.hedge_ratios,
+            args=(unhedged, hedge_gain, times, confidence),
+            jac=True,
+            bounds=[self.bounds] * len(self.hedge_ratios),
+            method="L-BFGS-B",
+        )
+
+        self.hedge_ratios = result.x
+        return result
@@ -0,0 +1,126 @@
+from strategies.Hedging import HedgingStrategy
+import numpy as np
+
+
+def half_spread_from_dataset(dataset, window=21):
+    """Half the average EURUSD spot bid/ask spread over the last window days"""
+    return 0.5 * dataset["EURUSD_Spot_SPREAD"].iloc[-window:].mean()
+
+
+def moneyness_delta(t, spot, forwards):
+    """
+    The DynamicDeltaHedging ratio, 1 - 0.3 * (S / F - 1) clipped to
+    [0.5, 1.5], but taken at today's spot rather than at the cash-flow date.
+    Returns one ratio per cash flow and path, shape (n_flows, n_paths).
+    """
+    moneyness = spot / forwards[:, None]
+    return np.clip(1.0 - 0.3 * (moneyness - 1.0), 0.5, 1.5)
+
+
+class RebalancedDeltaHedging(HedgingStrategy):
+    """
+    Delta hedge rebalanced along the daily simulated path.
+
+    Every EUR cash flow is hedged with forwards to its own date. Every
+    rebalance_every steps the target ratio of each outstanding flow is
+    recomputed by delta_rule(t, spot, forwards) from today's spot and the
+    initial forwards. Where it has moved by more than band (a fraction of the
+    flow) the difference is traded at today's forward
+    F(t, T) = S_t exp((r_d - r_f)(T - t)), paying half_spread USD per EUR
+    traded. On its date a flow converts at spot and its forwards settle
+    against that spot.
+
+    Only the current step is kept: per path, the hedged notional and locked
+    USD amount of each flow and the running accruals, so memory is
+    O(n_paths * n_flows) whatever the number of steps.
+    """
+
+    def __init__(
+        self,
+        cash_flows_eur,
+        rebalance_every=1,
+        band=0.0,
+        half_spread=0.0,
+        delta_rule=moneyness_delta,
+        name="Rebalanced Delta Hedge",
+    ):
+        super().__init__(name)
+        self.cash_flows_eur = cash_flows_eur
+        self.rebalance_every = max(int(rebalance_every), 1)
+        self.band = band
+        self.half_spread = half_spread
+        self.delta_rule = delta_rule
+        self.accruals = None
+
+    def hedge_chunk(self, model, job, forwards, times_to_cf):
+        """
+        Hedge one chunk of paths while it is simulated. Returns the USD cash
+        flows (n_paths, n_flows) and the per-path accruals.
+        """
+        n_steps, dt, observation_index, n_paths, _ = job
+        step_times = np.concatenate([[0.0], np.cumsum(dt)])
+        eur_cfs = np.array(list(self.cash_flows_eur.values()), dtype=float)
+        settle_steps = np.asarray(observation_index)
+        carry = model.rd - model.rf
+
+        hedged = np.zeros((len(eur_cfs), n_paths))  # EUR sold forward
+        locked = np.zeros((len(eur_cfs), n_paths))  # USD due on the forwards
+        usd_cf = np.zeros((n_paths, len(eur_cfs)))
+        accruals = {
+            "hedge_pnl": np.zeros(n_paths),
+            "forward_points": np.zeros(n_paths),
+            "spread_cost": np.zeros(n_paths),
+            "trades": np.zeros(n_paths),
+        }
+
+        for step, S, _, _ in model.step_chunk(job):
+            for flow in np.flatnonzero(settle_steps == step):
+                settlement = locked[flow] - hedged[flow] * S
+                usd_cf[:, flow] = eur_cfs[flow] * S + settlement
+                accruals["hedge_pnl"] += settlement
+
+            outstanding = settle_steps > step
+            if not outstanding.any():
+                break
+            if step % self.rebalance_every:
+                continue
+
+            tau = times_to_cf[outstanding] - step_times[step]
+            forward = S * np.exp(carry * tau)[:, None]
+            flows = eur_cfs[outstanding, None]
+
+            target = self.delta_rule(step_times[step], S, forwards[outstanding]) * flows
+            trade = target - hedged[outstanding]
+            trade = np.where(np.abs(trade) > self.band * np.abs(flows), trade, 0.0)
+
+            cost = np.abs(trade) * self.half_spread
+            locked[outstanding] += trade * forward - cost
+            hedged[outstanding] += trade
+
+            accruals["forward_points"] += (trade * (forward - S)).sum(axis=0)
+            accruals["spread_cost"] += cost.sum(axis=0)
+            accruals["trades"] += np.count_nonzero(trade, axis=0)
+
+        return usd_cf, accruals
+
+    def simulate_usd_cf(self, model, forward_rates, times_to_cf, n_paths=None):
+        """
+        USD cash flows on the model's paths, shape (n_paths, n_flows).
+
+        The chunks are those of model.simulate(max(times_to_cf),
+        observation_times=times_to_cf), so path i here is path i of the
+        other strategies. Chunks run on the model's worker pool. The
+        accruals (hedge P&L, forward points and spread costs in USD, and
+        the number of trades) are kept in self.accruals.
+        """
+        _, jobs = model.simulation_jobs(max(times_to_cf), times_to_cf, n_paths)
+        forwards = np.array(list(forward_rates.values()), dtype=float)
+        times = np.asarray(times_to_cf, dtype=float)
+        args = ([model] * len(jobs), jobs, [forwards] * len(jobs), [times] * len(jobs))
+        chunks = list(model.map_chunks(self.hedge_chunk, *args))
+
+        self.accruals = {
+            key: np.concatenate([chunk[1][key] for chunk in chunks])
+            for key in chunks[0][1]
+        }
+        return np.concatenate([chunk[0] for chunk in chunks])
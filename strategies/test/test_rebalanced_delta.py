@@ -0,0 +1,59 @@
+import numpy as np
+from model.Heston import HestonModel
+from strategies.RebalancedDelta import RebalancedDeltaHedging
+from strategies.StaticForward import StaticForwardHedging
+
+PARAMS = {
+    "v0": 0.0064,
+    "theta": 0.0081,
+    "kappa": 1.5,
+    "sigma": 0.3,
+    "rho": -0.3,
+    "mu": 0.0,
+    "usd_ir": 0.035,
+    "eur_ir": 0.0215,
+}
+S0 = 1.16
+CASH_FLOWS = {"2026-03-31": -10.0, "2026-09-30": -5.0, "2027-06-30": 20.0}
+TIMES = np.array([0.25, 0.75, 1.5])
+
+
+def full_hedge(t, spot, forwards):
+    return np.ones((len(forwards), spot.shape[-1]))
+
+
+def model_forwards(model):
+    rates = S0 * np.exp((model.rd - model.rf) * TIMES)
+    return dict(zip(CASH_FLOWS, rates))
+
+
+def test_full_hedge_matches_static_forward():
+    model = HestonModel(S0=S0, params=dict(PARAMS), n_paths=2000, n_chunks=2, dt=1 / 52)
+    forward_rates = model_forwards(model)
+
+    _, spot, _ = model.simulate(max(TIMES), observation_times=TIMES)
+    static = StaticForwardHedging(CASH_FLOWS).calculate_usd_cf(spot, forward_rates)
+
+    strategy = RebalancedDeltaHedging(CASH_FLOWS, band=0.0, half_spread=0.0, delta_rule=full_hedge)
+    rebalanced = strategy.simulate_usd_cf(model, forward_rates, TIMES)
+
+    # Hedged in full at inception, never traded again
+    assert np.allclose(rebalanced, static, rtol=1e-12)
+    assert (strategy.accruals["trades"] == len(CASH_FLOWS)).all()
+    assert (strategy.accruals["spread_cost"] == 0).all()
+
+
+def test_results_do_not_depend_on_n_workers():
+    results = []
+    for n_workers in (1, 2):
+        model = HestonModel(
+            S0=S0, params=dict(PARAMS), n_paths=1000, n_chunks=4, n_workers=n_workers, dt=1 / 52
+        )
+        strategy = RebalancedDeltaHedging(CASH_FLOWS, band=0.02, half_spread=1e-4)
+        usd_cf = strategy.simulate_usd_cf(model, model_forwards(model), TIMES)
+        results.append((usd_cf, strategy.accruals))
+
+    (serial, serial_accruals), (parallel, parallel_accruals) = results
+    assert np.array_equal(serial, parallel)
+    for key in serial_accruals:
+        assert np.array_equal(serial_accruals[key], parallel_accruals[key])